@@ -0,0 +1,82 @@
+"""Times `aggregate_spend` over a synthetic `TransactionFrame`.
+
+Run from the project root with `python -m benchmarks.aggregation [records]`.
+"""
+import sys
+import time
+
+from pypluggy.analytics.aggregate import aggregate_spend
+from pypluggy.analytics.frame import Categorical, TransactionFrame, np
+
+CATEGORIES = [
+    'Food',
+    'Transport',
+    'Shopping',
+    'Bills',
+    'Income',
+    'Leisure',
+    'Health',
+    'Education',
+]
+
+
+def make_frame(records: int) -> TransactionFrame:
+    random = np.random.default_rng(42)
+    start = np.datetime64('2023-01-01T00:00:00', 'ms')
+    milliseconds = random.integers(0, 730 * 86_400_000, records)
+    amounts = np.round(random.gamma(2.0, 60.0, records), 2)
+    types = random.integers(0, 2, records, dtype=np.int32)
+    foreign = random.random(records) < 0.05
+
+    return TransactionFrame(
+        {
+            'id': np.char.add('transaction-', np.arange(records).astype(str)),
+            'date': start + milliseconds.astype('timedelta64[ms]'),
+            'amount': np.where(types == 0, -amounts, amounts),
+            'amount_in_account_currency': np.where(
+                foreign, amounts * 5.1, np.nan
+            ),
+            'balance': np.zeros(records),
+            'account_id': Categorical(
+                random.integers(0, 20, records, dtype=np.int32),
+                [f'account-{index}' for index in range(20)],
+            ),
+            'type': Categorical(types, ['DEBIT', 'CREDIT']),
+            'status': Categorical(
+                np.ones(records, dtype=np.int32), ['PENDING', 'POSTED']
+            ),
+            'category': Categorical(
+                random.integers(-1, len(CATEGORIES), records, dtype=np.int32),
+                CATEGORIES,
+            ),
+            'currency_code': Categorical(
+                foreign.astype(np.int32), ['BRL', 'USD']
+            ),
+            'description': Categorical(
+                np.zeros(records, dtype=np.int32), ['Purchase']
+            ),
+        }
+    )
+
+
+def main(records: int) -> None:
+    frame = make_frame(records)
+    print(f'{records:,} transactions')
+
+    for keys in [
+        ['category'],
+        ['category', 'month'],
+        ['account_id', 'month', 'type'],
+        ['account_id', 'category', 'month'],
+    ]:
+        start = time.perf_counter()
+        totals = aggregate_spend(frame, keys)
+        elapsed = time.perf_counter() - start
+        print(
+            f'{" x ".join(keys):<32} {elapsed * 1000:>8.1f} ms '
+            f'{len(totals):>7,} groups'
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,104 @@
+"""Compares the schema-directed date parsing of `pypluggy.api.transforms`
+with a regex matched against every string of the document.
+
+Run from the project root with `python -m benchmarks.dates [pages]`.
+"""
+import datetime
+import json
+import re
+import sys
+import time
+from typing import Any, Callable
+
+from benchmarks.hydration import make_transaction
+from pypluggy.api.transforms import (
+    convert_dates,
+    deserialize_json_with_dates,
+    parse_datetime,
+)
+
+ISO_DATE_REGEXP = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$')
+
+PAGE_SIZE = 500
+
+
+def deserialize_with_regex(json_string: str) -> Any:
+    """Parses every string matching the API layout, whatever its key"""
+
+    def object_hook(value: dict[str, Any]) -> dict[str, Any]:
+        for key, item in value.items():
+            if isinstance(item, str) and ISO_DATE_REGEXP.match(item):
+                value[key] = datetime.datetime.fromisoformat(
+                    item[:-1] + '+00:00'
+                )
+        return value
+
+    return json.loads(json_string, object_hook=object_hook)
+
+
+def measure(name: str, function: Callable[[], Any], records: int) -> None:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(
+        f'{name:<28} {elapsed * 1000:>9.1f} ms '
+        f'{records / elapsed:>12,.0f} records/s'
+    )
+
+
+def main(pages: int) -> None:
+    payloads = [
+        json.dumps(
+            {
+                'results': [
+                    make_transaction(page * PAGE_SIZE + index)
+                    for index in range(PAGE_SIZE)
+                ],
+                'page': page + 1,
+                'total': pages * PAGE_SIZE,
+                'totalPages': pages,
+            }
+        )
+        for page in range(pages)
+    ]
+    records = pages * PAGE_SIZE
+
+    # Both paths must agree on the fields holding dates
+    sample = make_transaction(0)['date']
+    assert parse_datetime(sample) == datetime.datetime.fromisoformat(
+        sample[:-1] + '+00:00'
+    )
+
+    print(f'{pages} pages of {PAGE_SIZE} transactions')
+    measure(
+        'json.loads, no dates',
+        lambda: [json.loads(payload) for payload in payloads],
+        records,
+    )
+    measure(
+        'regex hook',
+        lambda: [deserialize_with_regex(payload) for payload in payloads],
+        records,
+    )
+    measure(
+        'date fields hook',
+        lambda: [
+            deserialize_json_with_dates(payload, memo=False)
+            for payload in payloads
+        ],
+        records,
+    )
+    measure(
+        'date fields hook, memo',
+        lambda: [deserialize_json_with_dates(payload) for payload in payloads],
+        records,
+    )
+    measure(
+        'json.loads + convert_dates',
+        lambda: [convert_dates(json.loads(payload)) for payload in payloads],
+        records,
+    )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
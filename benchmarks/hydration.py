@@ -0,0 +1,137 @@
+"""Compares decoding transactions into dataclasses, eagerly or lazily, with
+keeping raw dicts.
+
+Run from the project root with `python -m benchmarks.hydration [records]`.
+"""
+import dataclasses
+import json
+import sys
+import time
+from types import UnionType
+from typing import Any, Callable, Union, get_args, get_origin, get_type_hints
+
+from pypluggy.api.decoding import decode_many, get_decoder
+from pypluggy.api.lazy import lazy_many
+from pypluggy.api.type.transaction import Transaction
+
+
+def make_transaction(index: int) -> dict[str, Any]:
+    return {
+        'id': f'transaction-{index}',
+        'accountId': 'account-1',
+        'date': f'2024-{1 + index % 12:02d}-{1 + index % 28:02d}T10:00:00.000Z',
+        'description': f'Purchase {index}',
+        'descriptionRaw': None,
+        'type': 'DEBIT' if index % 3 else 'CREDIT',
+        'amount': -float(index % 100),
+        'amountInAccountCurrency': None,
+        'balance': 1000.0,
+        'currencyCode': 'BRL',
+        'category': 'Food',
+        'status': 'POSTED',
+        'providerCode': None,
+        'paymentData': {
+            'payer': {
+                'documentNumber': {'value': '12345678900', 'type': 'CPF'},
+                'name': 'Payer',
+                'accountNumber': None,
+                'branchNumber': None,
+                'routingNumber': None,
+            },
+            'receiver': None,
+            'receiverReferenceId': None,
+            'paymentMethod': 'PIX',
+            'referenceNumber': None,
+            'reason': None,
+        }
+        if index % 2
+        else None,
+        'creditCardMetadata': None,
+        'merchant': None,
+    }
+
+
+def decode_reflectively(cls: Any, data: Any) -> Any:
+    """Decodes by inspecting the annotations on every call, the cost the
+    precompiled decoders avoid"""
+    hints = get_type_hints(cls)
+    values = {}
+
+    for field in dataclasses.fields(cls):
+        value = data.get(field.name)
+        type_ = hints[field.name]
+        arguments = [
+            argument
+            for argument in get_args(type_)
+            if argument is not type(None)
+        ]
+        if get_origin(type_) in (Union, UnionType) and len(arguments) == 1:
+            type_ = arguments[0]
+
+        if value is not None and dataclasses.is_dataclass(type_):
+            value = decode_reflectively(type_, value)
+        elif value is not None:
+            decoder = get_decoder(type_)
+            if decoder is not None:
+                value = decoder(value)
+        values[field.name] = value
+
+    return cls(**values)
+
+
+def scan(records: list[Any]) -> None:
+    """Reads the fields most jobs need"""
+    for record in records:
+        record.id, record.date, record.amount, record.category
+
+
+def measure(name: str, function: Callable[[], Any], records: int) -> None:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(
+        f'{name:<24} {elapsed * 1000:>9.1f} ms '
+        f'{records / elapsed:>12,.0f} records/s'
+    )
+
+
+def main(records: int) -> None:
+    payload = json.dumps([make_transaction(index) for index in range(records)])
+    transactions = json.loads(payload)
+    # Built once, outside of the measurements
+    get_decoder(Transaction)
+
+    print(f'{records:,} transactions')
+    measure('json.loads (dicts)', lambda: json.loads(payload), records)
+    measure(
+        'decode_many',
+        lambda: decode_many(Transaction, transactions),
+        records,
+    )
+    measure(
+        'reflective decode',
+        lambda: [
+            decode_reflectively(Transaction, transaction)
+            for transaction in transactions
+        ],
+        records,
+    )
+    measure(
+        'decode + narrow scan',
+        lambda: scan(decode_many(Transaction, transactions)),
+        records,
+    )
+    measure(
+        'lazy + narrow scan',
+        lambda: scan(lazy_many(Transaction, transactions)),
+        records,
+    )
+    measure(
+        'json.loads + decode',
+        lambda: decode_many(Transaction, json.loads(payload)),
+        records,
+    )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,74 @@
+"""Compares the JSON decoder backends of `pypluggy.api.serialization` on
+pages of transactions, against decoding through `httpx.Response.json`.
+
+Run from the project root with `python -m benchmarks.json_decoding [pages]`.
+"""
+import json
+import sys
+import time
+from typing import Any, Callable
+
+import httpx
+
+from benchmarks.hydration import make_transaction
+from pypluggy.api.serialization import (
+    JSON_DECODERS,
+    is_json_decoder_available,
+    load_json_decoder,
+)
+
+PAGE_SIZE = 500
+
+
+def measure(name: str, function: Callable[[], Any], records: int) -> None:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(
+        f'{name:<24} {elapsed * 1000:>9.1f} ms '
+        f'{records / elapsed:>12,.0f} records/s'
+    )
+
+
+def main(pages: int) -> None:
+    responses = [
+        httpx.Response(
+            200,
+            content=json.dumps(
+                {
+                    'results': [
+                        make_transaction(page * PAGE_SIZE + index)
+                        for index in range(PAGE_SIZE)
+                    ],
+                    'page': page + 1,
+                    'total': pages * PAGE_SIZE,
+                    'totalPages': pages,
+                }
+            ).encode(),
+            headers={'content-type': 'application/json'},
+        )
+        for page in range(pages)
+    ]
+    records = pages * PAGE_SIZE
+
+    print(f'{pages} pages of {PAGE_SIZE} transactions')
+    measure(
+        'response.json()',
+        lambda: [response.json() for response in responses],
+        records,
+    )
+    for name in reversed(JSON_DECODERS):
+        if not is_json_decoder_available(name):
+            print(f'{name:<24} not installed')
+            continue
+
+        decoder = load_json_decoder(name)
+        measure(
+            name,
+            lambda: [decoder(response.content) for response in responses],
+            records,
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,65 @@
+"""Measures the memory held per transaction by raw dicts, the dataclasses of
+`pypluggy.api.type` and their compact `__slots__` variants.
+
+Run from the project root with `python -m benchmarks.memory [records]`.
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.hydration import make_transaction
+from pypluggy.api.decoding import decode_many, get_decoder
+from pypluggy.api.type.compact import compact
+from pypluggy.api.type.transaction import Transaction
+
+
+def get_shallow_size(record: Any) -> int:
+    """Size of the record itself, without the values of its fields"""
+    size = sys.getsizeof(record)
+    if hasattr(record, '__dict__'):
+        size += sys.getsizeof(record.__dict__)
+    return size
+
+
+def measure(name: str, load: Callable[[], Any], records: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    loaded = load()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f'{name:<28} {size / records:>8,.0f} bytes/record '
+        f'{get_shallow_size(loaded[0]):>6,} bytes/object'
+    )
+
+
+def main(records: int) -> None:
+    payload = json.dumps([make_transaction(index) for index in range(records)])
+    types = {
+        'dataclass': Transaction,
+        'compact dataclass': compact(Transaction),
+        'frozen compact dataclass': compact(Transaction, frozen=True),
+    }
+    # Built once, outside of the measurements
+    for cls in types.values():
+        get_decoder(cls)
+
+    print(
+        f'{records:,} transactions, '
+        f'{len(payload) / records:,.0f} bytes of JSON each'
+    )
+    measure('dict', lambda: json.loads(payload), records)
+    for name, cls in types.items():
+        measure(
+            name,
+            lambda cls=cls: decode_many(cls, json.loads(payload)),
+            records,
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
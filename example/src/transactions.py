@@ -1,24 +1,25 @@
 import asyncio
-import json
 
 import httpx
 
 from config import Settings
 from pypluggy.api.client import PluggyClient
-
-
-async def get_all_transactions(account_id: str, export_to_json: bool = False):
-    async with httpx.AsyncClient() as session:
-        client = PluggyClient(
-            Settings.CLIENT_ID, Settings.CLIENT_SECRET, session=session
-        )
-        txs = await client.fetch_all_transactions(account_id)
-        print(txs)
-
-    if export_to_json:
-        with open('transactions.json', 'w') as json_file:
-            json_str = json.dumps(txs, indent=4)
-            json_file.write(json_str)
+from pypluggy.export.stream import stream_transactions
+
+
+async def get_all_transactions(account_id: str, export_path: str = None):
+    # The client owns a pooled session, reused by every page request
+    async with PluggyClient(
+        Settings.CLIENT_ID, Settings.CLIENT_SECRET
+    ) as client:
+        if export_path:
+            # Pages are written as they arrive, ie. to 'transactions.csv.gz'
+            count = await stream_transactions(client, account_id, export_path)
+            print(f'{count} transactions exported to {export_path}')
+            return
+
+        async for transaction in client.iter_transactions(account_id):
+            print(transaction)
 
 
 async def update_txs_category(transaction_id, category_id):
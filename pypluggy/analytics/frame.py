@@ -0,0 +1,476 @@
+import datetime
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, AsyncIterable, Iterable, Optional, Sequence, Union
+
+from pypluggy.api.type.common import PageResponse
+from pypluggy.api.type.transaction import Transaction
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Columns holding floats, NaN standing for null, by key in the API objects
+FLOAT_COLUMNS = {
+    'amount': 'amount',
+    'amount_in_account_currency': 'amountInAccountCurrency',
+    'balance': 'balance',
+}
+# Columns dictionary-encoded as `Categorical`, by key in the API objects
+CATEGORICAL_COLUMNS = {
+    'account_id': 'accountId',
+    'type': 'type',
+    'status': 'status',
+    'category': 'category',
+    'currency_code': 'currencyCode',
+    'description': 'description',
+}
+# Up to this many combinations of key values, `group_by` numbers the groups
+# by counting rows instead of sorting them
+DENSE_GROUPING_CELLS = 1 << 20
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            'pypluggy.analytics requires numpy, install it with `pip install numpy`'
+        )
+
+
+def to_datetime64(value: Any) -> Any:
+    """Converts an ISO 8601 string or a datetime to a UTC `datetime64[ms]`"""
+    if value is None:
+        return np.datetime64('NaT', 'ms')
+    if isinstance(value, str):
+        if value.endswith('Z'):
+            return np.datetime64(value[:-1], 'ms')
+        value = datetime.datetime.fromisoformat(value)
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, 'ms')
+
+
+class Categorical:
+    """A column of repeated strings stored as integer codes into a list of
+    categories, -1 standing for null
+
+    Parameters
+    ----------
+    * codes (np.ndarray): Index of the category of each row
+    * categories (list[str]): The distinct values
+    """
+
+    def __init__(self, codes: 'np.ndarray', categories: list[str]):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, (int, np.integer)):
+            code = self.codes[index]
+            return None if code < 0 else self.categories[code]
+        return Categorical(self.codes[index], self.categories)
+
+    def __repr__(self) -> str:
+        return (
+            f'Categorical({len(self)} rows, '
+            f'{len(self.categories)} categories)'
+        )
+
+    def get_code(self, value: Optional[str]) -> int:
+        """Code of a value, -2 if it isn't one of the categories"""
+        if value is None:
+            return -1
+        try:
+            return self.categories.index(value)
+        except ValueError:
+            return -2
+
+    def equals(self, value: Optional[str]) -> 'np.ndarray':
+        """Mask of the rows holding `value`"""
+        return self.codes == self.get_code(value)
+
+    def isin(self, values: Iterable[Optional[str]]) -> 'np.ndarray':
+        """Mask of the rows holding any of `values`"""
+        return np.isin(self.codes, [self.get_code(value) for value in values])
+
+    def decode(self) -> list[Optional[str]]:
+        """The values of every row, as Python strings"""
+        categories = self.categories
+        return [
+            None if code < 0 else categories[code]
+            for code in self.codes.tolist()
+        ]
+
+
+class CategoricalEncoder:
+    """Assigns codes to the values of a column, page after page"""
+
+    def __init__(self):
+        self.codes: dict[str, int] = {}
+        self.categories: list[str] = []
+
+    def encode(
+        self, values: Iterable[Optional[str]], count: int
+    ) -> 'np.ndarray':
+        codes = self.codes
+        categories = self.categories
+
+        def get_code(value: Optional[str]) -> int:
+            if value is None:
+                return -1
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(categories)
+                categories.append(value)
+            return code
+
+        return np.fromiter(
+            (get_code(value) for value in values), np.int32, count=count
+        )
+
+
+@dataclass
+class Grouping:
+    """Rows of a `TransactionFrame` split by the values of some columns"""
+
+    # Value of each key column, one entry per group
+    keys: dict[str, Any]
+    # Group index of each row
+    inverse: 'np.ndarray'
+    # Number of groups
+    size: int
+
+    def count(self) -> 'np.ndarray':
+        return np.bincount(self.inverse, minlength=self.size)
+
+    def sum(self, values: 'np.ndarray') -> 'np.ndarray':
+        """Sums a column by group, ignoring NaNs"""
+        values = np.asarray(values, dtype=np.float64)
+        missing = np.isnan(values)
+        if missing.any():
+            values = np.where(missing, 0.0, values)
+        return np.bincount(self.inverse, weights=values, minlength=self.size)
+
+    def mean(self, values: 'np.ndarray') -> 'np.ndarray':
+        values = np.asarray(values, dtype=np.float64)
+        counts = np.bincount(
+            self.inverse[~np.isnan(values)], minlength=self.size
+        )
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.sum(values) / counts
+
+
+class TransactionFrame:
+    """Transactions stored by column, for analytics without a Python object
+    per row.
+
+    Amounts and balances are float64 arrays, null being NaN, dates are UTC
+    `datetime64[ms]`, and repeated strings, such as the category or the
+    type, are `Categorical` columns. Filters, sorts and group-bys work on
+    whole columns.
+
+    Build it with `from_transactions`, or page by page with `from_pages` or
+    `from_async_pages`, ie. from `client.iter_transaction_pages`.
+
+    Parameters
+    ----------
+    * columns (dict[str, Any]): The columns, all of the same length
+    """
+
+    def __init__(self, columns: dict[str, Any]):
+        require_numpy()
+        self.columns = columns
+
+    @classmethod
+    def from_transactions(
+        cls, transactions: Sequence[Transaction]
+    ) -> 'TransactionFrame':
+        return cls.from_pages([{'results': transactions}])
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[PageResponse]) -> 'TransactionFrame':
+        """Builds a frame from pages of transactions, converting each page to
+        arrays as it comes, so the pages themselves can be dropped"""
+        builder = TransactionFrameBuilder()
+        for page in pages:
+            builder.add(page['results'])
+        return builder.build()
+
+    @classmethod
+    async def from_async_pages(
+        cls, pages: AsyncIterable[PageResponse]
+    ) -> 'TransactionFrame':
+        """Like `from_pages`, for pages streamed by the client"""
+        builder = TransactionFrameBuilder()
+        async for page in pages:
+            builder.add(page['results'])
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.columns['id'])
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name]
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self) -> str:
+        return f'TransactionFrame({len(self)} transactions)'
+
+    @cached_property
+    def month(self) -> 'np.ndarray':
+        """Month of each transaction, as `datetime64[M]`"""
+        days = self.columns['date'].astype('datetime64[D]')
+        if not len(days) or np.isnat(days).any():
+            return days.astype('datetime64[M]')
+
+        # Converting days to months goes through the calendar, so only the
+        # days in range are converted and looked up for every row
+        days = days.astype(np.int64)
+        first = days.min()
+        months = (
+            np.arange(first, days.max() + 1)
+            .astype('datetime64[D]')
+            .astype('datetime64[M]')
+        )
+        return months[days - first]
+
+    def take(self, indices: Any) -> 'TransactionFrame':
+        """Selects rows by index array, slice or boolean mask"""
+        return TransactionFrame(
+            {name: column[indices] for name, column in self.columns.items()}
+        )
+
+    def filter(self, mask: 'np.ndarray') -> 'TransactionFrame':
+        return self.take(np.asarray(mask, dtype=bool))
+
+    def between(
+        self,
+        start: Union[datetime.date, str, None] = None,
+        end: Union[datetime.date, str, None] = None,
+    ) -> 'np.ndarray':
+        """Mask of the transactions dated from `start` up to `end`, inclusive"""
+        dates = self.columns['date'].astype('datetime64[D]')
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= dates >= np.datetime64(start, 'D')
+        if end is not None:
+            mask &= dates <= np.datetime64(end, 'D')
+        return mask
+
+    def get_sort_keys(
+        self, name: str, descending: bool = False
+    ) -> 'np.ndarray':
+        """Keys sorting a column in ascending order, nulls last. Descending
+        keys are negated ranks, so `lexsort` stays stable."""
+        column = self.columns[name]
+        if isinstance(column, Categorical):
+            # Sort by value rather than by order of appearance
+            order = np.argsort(np.array(column.categories, dtype=str))
+            ranks = np.empty(len(order) + 1, dtype=np.int64)
+            ranks[order] = np.arange(len(order))
+            # Nulls last
+            ranks[-1] = len(order)
+            ranks = ranks[column.codes]
+            nulls = column.codes < 0
+        elif not descending:
+            return column
+        else:
+            _, ranks = np.unique(column, return_inverse=True)
+            ranks = ranks.reshape(-1)
+            if column.dtype.kind == 'f':
+                nulls = np.isnan(column)
+            elif column.dtype.kind == 'M':
+                nulls = np.isnat(column)
+            else:
+                nulls = np.zeros(len(column), dtype=bool)
+
+        if not descending:
+            return ranks
+        keys = -ranks
+        # Nulls last, after the greatest value
+        keys[nulls] = 1
+        return keys
+
+    def sort(
+        self, by: Union[str, list[str]] = 'date', descending: bool = False
+    ) -> 'TransactionFrame':
+        """Sorts by one or several columns, the first one being the primary
+        key. The sort is stable, and nulls come last either way."""
+        names = [by] if isinstance(by, str) else by
+        order = np.lexsort(
+            [self.get_sort_keys(name, descending) for name in reversed(names)]
+        )
+        return self.take(order)
+
+    def get_group_codes(self, name: str) -> tuple['np.ndarray', Any, int]:
+        """Integer codes of a key column, the value of each code and their
+        number"""
+        if name == 'month':
+            months = self.month
+            if len(months) and not np.isnat(months).any():
+                # Months are consecutive integers, offsets from the first
+                # one are codes without sorting
+                months = months.astype(np.int64)
+                first = months.min()
+                size = int(months.max() - first) + 1
+                values = np.arange(first, first + size)
+                return months - first, values.astype('datetime64[M]'), size
+
+            values, codes = np.unique(months, return_inverse=True)
+            return codes, values, len(values)
+
+        column = self.columns[name]
+        if isinstance(column, Categorical):
+            # Null gets code 0
+            return (
+                column.codes.astype(np.int64) + 1,
+                [None, *column.categories],
+                len(column.categories) + 1,
+            )
+
+        values, codes = np.unique(column, return_inverse=True)
+        return codes, values, len(values)
+
+    def group_by(self, keys: Union[str, list[str]]) -> Grouping:
+        """Splits the rows by the values of one or several columns, plus
+        'month', in a single pass over the codes
+
+        Parameters
+        ----------
+        * keys (Union[str, list[str]]): Column names, ie. ['category', 'month']
+
+        Returns
+        -------
+        * Grouping: The groups, with the value of each key column per group
+        """
+        names = [keys] if isinstance(keys, str) else list(keys)
+        combined = None
+        key_values = []
+
+        for name in names:
+            codes, values, size = self.get_group_codes(name)
+            combined = codes if combined is None else combined * size + codes
+            key_values.append((name, values, size))
+
+        if combined is None:
+            raise ValueError('group_by needs at least one key')
+
+        cells = 1
+        for _, _, size in key_values:
+            cells *= size
+
+        if cells <= max(len(self), DENSE_GROUPING_CELLS):
+            # Few possible combinations, numbered by counting them instead
+            # of sorting the rows
+            present = np.bincount(combined, minlength=cells) > 0
+            groups = np.flatnonzero(present)
+            numbers = np.cumsum(present) - 1
+            inverse = numbers[combined]
+        else:
+            groups, inverse = np.unique(combined, return_inverse=True)
+        group_count = len(groups)
+
+        keys_by_name = {}
+        for name, values, size in reversed(key_values):
+            codes = groups % size
+            groups = groups // size
+            if isinstance(values, list):
+                keys_by_name[name] = [values[code] for code in codes.tolist()]
+            else:
+                keys_by_name[name] = values[codes]
+
+        return Grouping(
+            keys={name: keys_by_name[name] for name in names},
+            inverse=inverse.reshape(-1),
+            size=group_count,
+        )
+
+
+class TransactionFrameBuilder:
+    """Accumulates pages of transactions as arrays, see `TransactionFrame`"""
+
+    def __init__(self):
+        require_numpy()
+        self.chunks: dict[str, list[Any]] = {
+            'id': [],
+            'date': [],
+            **{name: [] for name in FLOAT_COLUMNS},
+            **{name: [] for name in CATEGORICAL_COLUMNS},
+        }
+        self.encoders = {
+            name: CategoricalEncoder() for name in CATEGORICAL_COLUMNS
+        }
+
+    def add(self, transactions: Sequence[Transaction]) -> None:
+        count = len(transactions)
+        chunks = self.chunks
+
+        chunks['id'].append(
+            np.array(
+                [transaction['id'] for transaction in transactions], dtype=str
+            )
+        )
+        chunks['date'].append(
+            np.array(
+                [
+                    to_datetime64(transaction.get('date'))
+                    for transaction in transactions
+                ],
+                dtype='datetime64[ms]',
+            )
+        )
+        for name, key in FLOAT_COLUMNS.items():
+            chunks[name].append(
+                np.fromiter(
+                    (
+                        np.nan if value is None else value
+                        for value in (
+                            transaction.get(key)
+                            for transaction in transactions
+                        )
+                    ),
+                    np.float64,
+                    count=count,
+                )
+            )
+        for name, key in CATEGORICAL_COLUMNS.items():
+            chunks[name].append(
+                self.encoders[name].encode(
+                    (transaction.get(key) for transaction in transactions),
+                    count,
+                )
+            )
+
+    def build(self) -> TransactionFrame:
+        columns: dict[str, Any] = {}
+
+        columns['id'] = (
+            np.concatenate(self.chunks['id'])
+            if self.chunks['id']
+            else np.array([], dtype=str)
+        )
+        columns['date'] = self.concatenate('date', 'datetime64[ms]')
+        for name in FLOAT_COLUMNS:
+            columns[name] = self.concatenate(name, np.float64)
+        for name in CATEGORICAL_COLUMNS:
+            columns[name] = Categorical(
+                self.concatenate(name, np.int32),
+                list(self.encoders[name].categories),
+            )
+
+        return TransactionFrame(columns)
+
+    def concatenate(self, name: str, dtype: Any) -> 'np.ndarray':
+        chunks = self.chunks[name]
+        if not chunks:
+            return np.array([], dtype=dtype)
+        return np.concatenate(chunks).astype(dtype, copy=False)
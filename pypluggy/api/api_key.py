@@ -0,0 +1,106 @@
+import asyncio
+import base64
+import json
+import time
+from typing import Awaitable, Callable, Optional
+
+# Lifetime of the keys issued by the /auth endpoint, in seconds
+DEFAULT_API_KEY_TTL = 2 * 60 * 60
+# How long before expiring a key starts being refreshed, in seconds
+DEFAULT_REFRESH_MARGIN = 5 * 60
+
+
+def get_api_key_expiry(api_key: str) -> Optional[float]:
+    """Reads the expiry timestamp from the `exp` claim of an API key
+
+    Parameters
+    ----------
+    * api_key (str): The API key, a JWT issued by the /auth endpoint
+
+    Returns
+    -------
+    * Optional[float]: Unix timestamp of the expiry, None if it can't be read
+    """
+    try:
+        payload = api_key.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class ApiKeyManager:
+    """Keeps a valid API key around for the requests of a client.
+
+    Only one call to the /auth endpoint runs at a time, concurrent callers
+    wait for it and share its key. Keys close to their expiry are refreshed
+    in the background, so callers keep using the current key meanwhile.
+    """
+
+    def __init__(
+        self,
+        request_api_key: Callable[[], Awaitable[str]],
+        api_key: Optional[str] = None,
+        ttl: float = DEFAULT_API_KEY_TTL,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+    ):
+        self.request_api_key = request_api_key
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.api_key: Optional[str] = None
+        self.expires_at: float = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        if api_key is not None:
+            self.set(api_key)
+
+    def set(self, api_key: Optional[str]) -> None:
+        """Stores a key, reading its expiry or assuming the default TTL"""
+        self.api_key = api_key
+        if api_key is None:
+            self.expires_at = 0.0
+        else:
+            self.expires_at = get_api_key_expiry(api_key) or (
+                time.time() + self.ttl
+            )
+
+    def is_valid(self) -> bool:
+        return self.api_key is not None and time.time() < self.expires_at
+
+    async def get(self) -> str:
+        """Returns a valid API key, requesting a new one when needed"""
+        if not self.is_valid():
+            return await self.refresh(stale_key=self.api_key)
+
+        if time.time() >= self.expires_at - self.refresh_margin:
+            self._schedule_refresh()
+
+        return self.api_key
+
+    async def refresh(self, stale_key: Optional[str] = None) -> str:
+        """Requests a new API key to replace `stale_key`
+
+        If another caller already replaced `stale_key` while this one was
+        waiting, its key is returned without calling /auth again.
+        """
+        async with self._lock:
+            if self.is_valid() and self.api_key != stale_key:
+                return self.api_key
+
+            self.set(await self.request_api_key())
+            return self.api_key
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(
+                self._background_refresh(self.api_key)
+            )
+
+    async def _background_refresh(self, stale_key: Optional[str]) -> None:
+        try:
+            await self.refresh(stale_key=stale_key)
+        except Exception as error:
+            # The current key is still valid, the next call will try again
+            print(f'[Pluggy SDK] API key refresh failed: {error}')
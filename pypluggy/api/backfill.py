@@ -0,0 +1,123 @@
+import asyncio
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from pypluggy.api.type.transaction import Transaction
+
+from .pagination import DEFAULT_PAGE_CONCURRENCY, MAX_PAGE_SIZE
+from .utils import gather_or_cancel
+
+if TYPE_CHECKING:
+    from .client import PluggyClient
+
+# Span of the date windows an account history is split into
+DEFAULT_BACKFILL_WINDOW = timedelta(days=30)
+# Windows with more pages than this are split in two
+DEFAULT_MAX_WINDOW_PAGES = 4
+
+
+def split_date_range(
+    start: date, end: date, window: timedelta = DEFAULT_BACKFILL_WINDOW
+) -> list[tuple[date, date]]:
+    """Splits a date range into consecutive windows
+
+    Parameters
+    ----------
+    * start (date): First date of the range
+    * end (date): Last date of the range, included
+    * window (timedelta): Span of each window, at least one day
+
+    Returns
+    -------
+    * list[tuple[date, date]]: First and last date of each window, both included
+    """
+    if window < timedelta(days=1):
+        raise ValueError('window must span at least one day')
+
+    windows = []
+    while start <= end:
+        window_end = min(end, start + window - timedelta(days=1))
+        windows.append((start, window_end))
+        start = window_end + timedelta(days=1)
+
+    return windows
+
+
+async def backfill_transactions(
+    client: 'PluggyClient',
+    account_id: str,
+    start: date,
+    end: date,
+    window: timedelta = DEFAULT_BACKFILL_WINDOW,
+    max_window_pages: int = DEFAULT_MAX_WINDOW_PAGES,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+) -> list[Transaction]:
+    """Fetches the transactions of an account between two dates, window by
+    window in parallel, splitting windows that hold too many pages
+
+    Parameters
+    ----------
+    * client (PluggyClient): The client used to fetch transactions
+    * account_id (str): The account id
+    * start (date): First date of the history to fetch
+    * end (date): Last date of the history to fetch, included
+    * window (timedelta): Span of the initial windows
+    * max_window_pages (int): Windows with more pages than this are split in two
+    * concurrency (int): Maximum number of requests sent at the same time
+
+    Returns
+    -------
+    * list[Transaction]: The transactions without duplicates, sorted by date
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_window(
+        window_start: date, window_end: date
+    ) -> list[Transaction]:
+        paginator = client.paginate(
+            client.fetch_transactions,
+            account_id,
+            options={
+                'pageSize': MAX_PAGE_SIZE,
+                'from_': window_start.isoformat(),
+                'to': window_end.isoformat(),
+            },
+            semaphore=semaphore,
+        )
+        first_page = await paginator.fetch(1)
+
+        if (
+            first_page['totalPages'] > max_window_pages
+            and window_start < window_end
+        ):
+            middle = window_start + timedelta(
+                days=(window_end - window_start).days // 2
+            )
+            halves = await gather_windows(
+                [
+                    (window_start, middle),
+                    (middle + timedelta(days=1), window_end),
+                ]
+            )
+            return [transaction for half in halves for transaction in half]
+
+        return await paginator.collect(first_page)
+
+    async def gather_windows(
+        windows: list[tuple[date, date]]
+    ) -> list[list[Transaction]]:
+        return await gather_or_cancel(
+            fetch_window(window_start, window_end)
+            for window_start, window_end in windows
+        )
+
+    results = await gather_windows(split_date_range(start, end, window))
+
+    # Windows share their boundaries with the API filters, keep each
+    # transaction once
+    transactions: dict[str, Transaction] = {}
+    for window_transactions in results:
+        for transaction in window_transactions:
+            transactions[transaction['id']] = transaction
+
+    return sorted(transactions.values(), key=lambda t: str(t['date']))
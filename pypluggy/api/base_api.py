@@ -1,12 +1,19 @@
-import json as json
+import asyncio
 from typing import Any, Optional, TypedDict, Union
 
 import httpx
-import requests
 
 from pypluggy.api.type.common import PageResponse
 
+from .api_key import ApiKeyManager
+from .cache import MISSING, ResponseCache, ValidatorCache
 from .config import Config
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .serialization import JsonDecoder, get_json_decoder
+from .session import SessionConfig, create_session, get_pool_stats
+from .transforms import convert_dates
+from .utils import request_key
 
 QueryParameters = dict[str, Union[int, list[int], str, list[str], bool]]
 
@@ -22,23 +29,41 @@ class BaseApi:
         self,
         client_id: str,
         client_secret: str,
-        session: httpx.AsyncClient,
+        session: Optional[httpx.AsyncClient] = None,
         base_url: str = None,
         api_key: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce_requests: bool = True,
+        cache: Optional[ResponseCache] = None,
+        validator_cache: Optional[ValidatorCache] = None,
+        session_config: Optional[SessionConfig] = None,
+        parse_dates: bool = False,
+        json_decoder: Union[str, JsonDecoder, None] = None,
     ):
 
-        # Initializes the Client Session for Async Requests
-        self.session = session
-
         # Validate client_id and client_secret
         if not client_id or not client_secret:
             raise ValueError('Missing authorization for API communication')
 
+        # Initializes the Client Session for Async Requests, owning it when
+        # none is provided so its connections are reused until `aclose`
+        self.owns_session = session is None
+        self.session = session or create_session(session_config)
+
         # Set base_url to PLUGGY_API_URL if not provided
-        self.base_url = Config.PLUGGY_API_URL
+        self.base_url = base_url or Config.PLUGGY_API_URL
 
         # Set other attributes
-        self.api_key = api_key
+        self.api_key_manager = ApiKeyManager(self.request_api_key, api_key)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.coalesce_requests = coalesce_requests
+        self.in_flight_requests: dict[str, asyncio.Future] = {}
+        self.cache = cache
+        self.validator_cache = validator_cache
+        self.parse_dates = parse_dates
+        self.json_decoder = get_json_decoder(json_decoder)
         self.client_id = client_id
         self.client_secret = client_secret
         self.default_headers = {
@@ -46,24 +71,50 @@ class BaseApi:
             'content-type': 'application/json',
         }
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the session, if it was created by this client"""
+        if self.owns_session:
+            await self.session.aclose()
+
+    def pool_stats(self) -> dict[str, int]:
+        """Counts the open, idle, active and HTTP/2 connections of the session"""
+        return get_pool_stats(self.session)
+
     def map_to_query_string(self, params: dict[str, QueryParameters]) -> str:
         if not params:
             return ''
 
+        # Keys clashing with Python keywords carry a trailing underscore in
+        # the filter types, ie. `from_`, which the API doesn't expect
         query = '&'.join(
             [
-                f'{key}={params[key]}'
+                f'{key.rstrip("_")}={params[key]}'
                 for key in params
                 if params[key] is not None
             ]
         )
         return f'?{query}' if query else ''
 
-    async def get_api_key(self) -> str:
+    @property
+    def api_key(self) -> Optional[str]:
+        return self.api_key_manager.api_key
 
-        if self.api_key is not None:
-            return self.api_key
+    @api_key.setter
+    def api_key(self, api_key: Optional[str]) -> None:
+        self.api_key_manager.set(api_key)
+
+    async def get_api_key(self) -> str:
+        """Returns a valid API key, authenticating only when needed"""
+        return await self.api_key_manager.get()
 
+    async def request_api_key(self) -> str:
+        """Requests a new API key from the /auth endpoint"""
         json_data = {
             'clientId': self.client_id,
             'clientSecret': self.client_secret,
@@ -71,33 +122,199 @@ class BaseApi:
 
         url = f'{self.base_url}/auth'
 
-        try:
-            response = await self.session.post(
-                url, json=json_data, headers=self.default_headers
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire('auth')
+
+        response = await self.session.post(
+            url, json=json_data, headers=self.default_headers
+        )
+        response.raise_for_status()
+
+        return self.json_decoder(response.content)['apiKey']
+
+    async def send_request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Sends an authenticated request, retrying it per `retry_policy`"""
+        return await self.retry_policy.run(
+            method,
+            lambda: self.send_authenticated_request(
+                method, url, body, headers
+            ),
+        )
+
+    async def send_authenticated_request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Sends a single request carrying the API key
+
+        A 401 response is retried once with a fresh API key, in case the
+        current one was revoked or expired on the server side.
+        """
+        api_key = await self.get_api_key()
+        response = await self.send_rate_limited_request(
+            method, url, api_key, body, headers
+        )
+
+        if response.status_code == 401:
+            api_key = await self.api_key_manager.refresh(stale_key=api_key)
+            response = await self.send_rate_limited_request(
+                method, url, api_key, body, headers
             )
-            if response.status_code == 200:
-                self.api_key = json.loads(response.text)['apiKey']
-                return self.api_key
-        except BaseException as e:
-            raise e
+
+        return response
+
+    async def send_rate_limited_request(
+        self,
+        method: str,
+        url: str,
+        api_key: str,
+        body: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> httpx.Response:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(httpx.URL(url).path)
+
+        return await self.session.request(
+            method,
+            url,
+            headers={
+                **self.default_headers,
+                **(headers or {}),
+                'X-API-KEY': api_key,
+            },
+            json=body,
+        )
 
     async def create_get_request(
         self, endpoint: str, params: Optional[QueryParameters] = None
     ) -> PageResponse:
+        """Sends a GET request and returns its decoded body
+
+        Responses of the endpoints configured in `cache` are served from it
+        while fresh, and while stale within its `stale_while_revalidate`
+        window, refreshing them in the background. With `coalesce_requests`
+        enabled, concurrent calls for the same endpoint and params share a
+        single HTTP request. Either way the returned object may be shared and
+        should be treated as read-only. With `parse_dates` enabled, the values
+        of known date fields are returned as `date` and `datetime` objects.
+        """
+        key = request_key(endpoint, params)
+
+        if self.cache is not None and self.cache.get_ttl(endpoint):
+            cached, is_fresh = self.cache.lookup(key)
+            if cached is not MISSING:
+                if not is_fresh:
+                    self.revalidate_get_request(key, endpoint, params)
+                return self.convert_dates(cached)
+
+        if not self.coalesce_requests:
+            response = await self.load_get_request(endpoint, params)
+        else:
+            response = await asyncio.shield(
+                self.get_in_flight_request(key, endpoint, params)
+            )
+
+        return self.convert_dates(response)
+
+    def convert_dates(self, body: Any) -> Any:
+        """Parses the dates of a response body when `parse_dates` is set.
+        The body is copied, so cached and shared responses keep strings."""
+        if not self.parse_dates:
+            return body
+        return convert_dates(body)
+
+    def get_in_flight_request(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[QueryParameters] = None,
+    ) -> asyncio.Future:
+        """Returns the pending request for `key`, starting one if needed"""
+        request = self.in_flight_requests.get(key)
+
+        if request is None:
+            request = asyncio.ensure_future(
+                self.load_get_request(endpoint, params)
+            )
+            self.in_flight_requests[key] = request
+            request.add_done_callback(
+                lambda done: self.forget_in_flight_request(key, done)
+            )
+
+        return request
+
+    def revalidate_get_request(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[QueryParameters] = None,
+    ) -> None:
+        """Refreshes a stale cache entry in the background"""
+        request = self.get_in_flight_request(key, endpoint, params)
+        # The stale entry was already served, failures only need consuming
+        request.add_done_callback(
+            lambda done: done.cancelled() or done.exception()
+        )
+
+    async def load_get_request(
+        self, endpoint: str, params: Optional[QueryParameters] = None
+    ) -> PageResponse:
+        """Sends a GET request, storing its body in `cache` when configured"""
+        response = await self.send_get_request(endpoint, params)
+
+        if self.cache is not None:
+            ttl = self.cache.get_ttl(endpoint)
+            if ttl:
+                self.cache.set(request_key(endpoint, params), response, ttl)
+
+        return response
+
+    def forget_in_flight_request(
+        self, key: str, request: asyncio.Future
+    ) -> None:
+        if self.in_flight_requests.get(key) is request:
+            del self.in_flight_requests[key]
+
+    async def send_get_request(
+        self, endpoint: str, params: Optional[QueryParameters] = None
+    ) -> PageResponse:
 
         try:
-            api_key = await self.get_api_key()
             url = f'{self.base_url}/{endpoint}'
 
             if params:
                 url = f'{self.base_url}/{endpoint}/{self.map_to_query_string(params)}'
 
-            response = await self.session.get(
-                url, headers={**self.default_headers, 'X-API-KEY': api_key}
-            )
+            validators = None
+            headers = None
+
+            if self.validator_cache is not None:
+                validators = self.validator_cache.get(url)
+                if validators is not None:
+                    headers = self.validator_cache.get_headers(validators)
+
+            response = await self.send_request('GET', url, headers=headers)
+
+            if response.status_code == 304 and validators is not None:
+                self.validator_cache.not_modified += 1
+                return validators['body']
+
             response.raise_for_status()
+            body = self.json_decoder(response.content)
 
-            return response.json()
+            if self.validator_cache is not None:
+                self.validator_cache.store(url, response.headers, body)
+
+            return body
 
         except httpx.HTTPError as error:
             print(f'[Pluggy SDK] HTTP request failed: {error}')
@@ -153,7 +370,6 @@ class BaseApi:
         params: Optional[dict[str, Any]] = None,
         body: Optional[dict[str, Any]] = None,
     ) -> Any:
-        api_key = await self.get_api_key()
         url = f'{self.base_url}/{endpoint}{self.map_to_query_string(params)}'
 
         try:
@@ -164,20 +380,18 @@ class BaseApi:
                     if value is not None
                 }
 
-            response = await self.session.request(
-                method,
-                url,
-                headers={**self.default_headers, 'X-API-KEY': api_key},
-                json=body,
-            )
+            response = await self.send_request(method, url, body)
 
             response.raise_for_status()
 
-            return response.json()
+            return self.json_decoder(response.content)
 
-        except requests.HTTPError as error:
+        except httpx.HTTPStatusError as error:
             print(f'[Pluggy SDK] HTTP request failed: {error.response.text}')
             raise error
+        except httpx.HTTPError as error:
+            print(f'[Pluggy SDK] HTTP request failed: {error}')
+            raise error
         except Exception as error:
             print(f'[Pluggy SDK] Error: {error}')
             raise error
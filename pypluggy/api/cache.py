@@ -0,0 +1,247 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional
+
+from .utils import endpoint_family, request_key
+
+# Seconds to keep the responses of each endpoint family
+DEFAULT_TTLS = {
+    'connectors': 60 * 60,
+    'categories': 24 * 60 * 60,
+}
+
+# Returned by `ResponseCache.get` when there is no fresh entry for a key
+MISSING = object()
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    # Unix timestamp after which the entry is stale, None if it never is
+    expires_at: Optional[float]
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        if self.expires_at is None:
+            return True
+        return (now or time.time()) < self.expires_at
+
+
+class ResponseCache(ABC):
+    """Base class of the caches BaseApi can put in front of GET requests.
+
+    Only endpoint families listed in `ttls` are cached, so caching stays
+    opt-in per endpoint. Subclasses implement the storage.
+
+    Parameters
+    ----------
+    * ttls (Optional[dict[str, float]]): Seconds to keep the responses of each endpoint
+    family, ie. `{'connectors': 3600}`. Defaults to `DEFAULT_TTLS`.
+    * stale_while_revalidate (float): Seconds after expiring during which an entry
+    is still served while it is refreshed in the background
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[dict[str, float]] = None,
+        stale_while_revalidate: float = 0,
+    ):
+        # A copy, so changing the TTLs of a cache leaves the others alone
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get_ttl(self, endpoint: str) -> Optional[float]:
+        """Seconds to keep the responses of `endpoint`, None if not cached"""
+        return self.ttls.get(endpoint_family(endpoint))
+
+    @abstractmethod
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Returns the entry stored for `key`, fresh or not"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """Stores `value` for `ttl` seconds, forever if `ttl` is None"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Removes the entry stored for `key`, if any"""
+
+    @abstractmethod
+    def keys(self) -> Iterable[str]:
+        """Returns the keys of all stored entries"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes every entry"""
+
+    def get(self, key: str) -> Any:
+        """Returns the fresh value stored for `key`, or `MISSING`"""
+        entry = self.get_entry(key)
+
+        if entry is None or not entry.is_fresh():
+            self.misses += 1
+            return MISSING
+
+        self.hits += 1
+        return entry.value
+
+    def lookup(self, key: str) -> tuple[Any, bool]:
+        """Returns the value stored for `key` and whether it is fresh
+
+        Entries expired for less than `stale_while_revalidate` seconds are
+        returned as not fresh, older ones and absent keys return `MISSING`.
+        """
+        entry = self.get_entry(key)
+        now = time.time()
+
+        if entry is not None:
+            if entry.is_fresh(now):
+                self.hits += 1
+                return entry.value, True
+
+            if entry.expires_at + self.stale_while_revalidate > now:
+                self.stale_hits += 1
+                return entry.value, False
+
+        self.misses += 1
+        return MISSING, False
+
+    def invalidate(
+        self, endpoint: str, params: Optional[dict[str, Any]] = None
+    ) -> None:
+        """Removes the cached responses of an endpoint
+
+        Parameters
+        ----------
+        * endpoint (str): The endpoint, ie. `connectors` or `connectors/2`
+        * params (Optional[dict[str, Any]]): Only remove the response for these params.
+        If none submitted, the responses for every params are removed.
+        """
+        if params:
+            self.delete(request_key(endpoint, params))
+            return
+
+        for key in list(self.keys()):
+            if key == endpoint or key.startswith(f'{endpoint}?'):
+                self.delete(key)
+
+    def invalidate_family(self, family: str) -> None:
+        """Removes the cached responses of every endpoint of a family,
+        ie. `connectors` removes `connectors` and `connectors/2` responses"""
+        for key in list(self.keys()):
+            if endpoint_family(key) == family:
+                self.delete(key)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+        }
+
+
+class TTLCache(ResponseCache):
+    """In memory response cache, bounded to `maxsize` entries with LRU eviction
+
+    Parameters
+    ----------
+    * ttls (Optional[dict[str, float]]): Seconds to keep the responses of each endpoint family
+    * maxsize (int): Maximum number of entries kept
+    * stale_while_revalidate (float): Seconds an expired entry is still served while refreshed
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[dict[str, float]] = None,
+        maxsize: int = 1024,
+        stale_while_revalidate: float = 0,
+    ):
+        super().__init__(ttls, stale_while_revalidate)
+        self.maxsize = maxsize
+        self.evictions = 0
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = None if ttl is None else time.time() + ttl
+        self.entries[key] = CacheEntry(value, expires_at)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    def keys(self) -> Iterable[str]:
+        return self.entries.keys()
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **super().stats(),
+            'size': len(self.entries),
+            'evictions': self.evictions,
+        }
+
+
+class ValidatorCache:
+    """Keeps the `ETag` / `Last-Modified` validators of GET responses with
+    their decoded body, so unchanged resources can be revalidated with a
+    conditional request and served from here on a 304 response.
+
+    Parameters
+    ----------
+    * backend (Optional[ResponseCache]): Where validators and bodies are stored.
+    Defaults to an in memory TTLCache.
+    """
+
+    def __init__(self, backend: Optional[ResponseCache] = None):
+        self.backend = backend if backend is not None else TTLCache()
+        self.not_modified = 0
+
+    def get_key(self, url: str) -> str:
+        return f'validators:{url}'
+
+    def get(self, url: str) -> Optional[dict[str, Any]]:
+        """Returns the validators and body stored for `url`, if any"""
+        entry = self.backend.get_entry(self.get_key(url))
+        return entry.value if entry is not None else None
+
+    def get_headers(self, validators: dict[str, Any]) -> dict[str, str]:
+        """Builds the conditional request headers from stored validators"""
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def store(self, url: str, headers: Mapping[str, str], body: Any) -> None:
+        """Stores the body of a response that carries validators"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+
+        if etag is None and last_modified is None:
+            return
+
+        self.backend.set(
+            self.get_key(url),
+            {'etag': etag, 'last_modified': last_modified, 'body': body},
+            None,
+        )
+
+    def forget(self, url: str) -> None:
+        self.backend.delete(self.get_key(url))
@@ -1,13 +1,47 @@
-from typing import Dict, Optional
+import asyncio
+from datetime import date, timedelta
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Union,
+)
 
 import httpx
 
+from .backfill import (
+    DEFAULT_BACKFILL_WINDOW,
+    DEFAULT_MAX_WINDOW_PAGES,
+    backfill_transactions,
+)
 from .base_api import BaseApi
+from .cache import ResponseCache, ValidatorCache
+from .pagination import (
+    DEFAULT_PAGE_CONCURRENCY,
+    DEFAULT_PREFETCH,
+    MAX_PAGE_SIZE,
+    Paginator,
+)
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .serialization import JsonDecoder
+from .session import SessionConfig
+from .snapshot import ItemSnapshot, fetch_item_snapshot
+from .sync import (
+    DEFAULT_SYNC_OVERLAP,
+    TransactionSyncCursor,
+    TransactionSyncResult,
+    diff_transactions,
+    get_window_start,
+)
 from .type.account import Account, AccountType
 from .type.auth import ConnectTokenOptions
 from .type.category import Category
 from .type.common import PageFilters, PageResponse
-from .type.connector import ConnectorFilters
+from .type.connector import Connector, ConnectorFilters
 from .type.identity import IdentityResponse
 from .type.income_report import IncomeReport
 from .type.investment import (
@@ -29,11 +63,63 @@ class PluggyClient(BaseApi):
         self,
         client_id: str,
         client_secret: str,
-        session: httpx.AsyncClient,
+        session: Optional[httpx.AsyncClient] = None,
         base_url: str = None,
         api_key: str | None = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce_requests: bool = True,
+        cache: Optional[ResponseCache] = None,
+        validator_cache: Optional[ValidatorCache] = None,
+        session_config: Optional[SessionConfig] = None,
+        parse_dates: bool = False,
+        json_decoder: Union[str, JsonDecoder, None] = None,
     ):
-        super().__init__(client_id, client_secret, session, base_url, api_key)
+        super().__init__(
+            client_id,
+            client_secret,
+            session,
+            base_url,
+            api_key,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            coalesce_requests=coalesce_requests,
+            cache=cache,
+            validator_cache=validator_cache,
+            session_config=session_config,
+            parse_dates=parse_dates,
+            json_decoder=json_decoder,
+        )
+
+    def paginate(
+        self,
+        fetch: Callable[..., Awaitable[PageResponse]],
+        *args: Any,
+        options: dict[str, Any] = {},
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+        max_pages: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Paginator:
+        """Build a paginator over any paged fetch method
+
+        Parameters
+        ----------
+        * fetch (Callable): A paged fetch method of this client, ie. `client.fetch_loans`
+        * args: Positional arguments of `fetch`, ie. the item id
+        * options (dict): Filters sent with every page request
+        * concurrency (int): Maximum number of pages requested at the same time
+        * max_pages (Optional[int]): Stop after this many pages
+        * semaphore (Optional[asyncio.Semaphore]): Shared semaphore bounding the requests
+
+        Returns
+        -------
+        * Paginator: Collects or streams the results of every page
+        """
+
+        async def fetch_page(page: int) -> PageResponse:
+            return await fetch(*args, options={**options, 'page': page})
+
+        return Paginator(fetch_page, concurrency, max_pages, semaphore)
 
     async def fetch_connectors(
         self, options: ConnectorFilters = {}
@@ -41,6 +127,26 @@ class PluggyClient(BaseApi):
         """ "Fetch all available connectors"""
         return await self.create_get_request('connectors', options)
 
+    async def fetch_all_connectors(
+        self,
+        options: ConnectorFilters = {},
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> list[Connector]:
+        """Fetch the connectors of every page
+
+        Parameters
+        ----------
+        * options (ConnectorFilters): Request search filters
+        * concurrency (int): Maximum number of pages requested at the same time
+
+        Returns
+        -------
+        * list[Connector]: The connectors, in page order
+        """
+        return await self.paginate(
+            self.fetch_connectors, options=options, concurrency=concurrency
+        ).collect()
+
     async def fetch_connector(self, id: int) -> PageResponse:
         """Fetch a single connector"""
         return await self.create_get_request(endpoint=f'connectors/{id}')
@@ -127,6 +233,28 @@ class PluggyClient(BaseApi):
             {'id': id, 'parameters': parameters, 'options': options},
         )
 
+    async def fetch_item_snapshot(
+        self, item_id: str, concurrency: int = DEFAULT_PAGE_CONCURRENCY
+    ) -> ItemSnapshot:
+        """Fetch an Item together with all of its collected products
+
+        Independent products are fetched concurrently, and each account's
+        or investment's transactions as soon as their parent list arrives,
+        all under a single concurrency cap. Products not requested for the
+        Item, or never collected, are skipped.
+
+        Parameters
+        ----------
+        * item_id (str): The Item id
+        * concurrency (int): Maximum number of requests sent at the same time
+
+        Returns
+        -------
+        * ItemSnapshot: The Item, accounts, transactions, investments, loans,
+        identity, opportunities and income reports
+        """
+        return await fetch_item_snapshot(self, item_id, concurrency)
+
     async def update_item_mfa(self, id: str, parameters: object):
         """This endpoint receives an object with the MFA parameter name (aka 'token') as key.
         This name is obtained from parameter field in an item in USER_WAITING_INPUT status.
@@ -181,40 +309,162 @@ class PluggyClient(BaseApi):
         )
 
     async def fetch_all_transactions(
-        self, account_id: str
+        self,
+        account_id: str,
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+        options: TransactionFilters = {},
     ) -> list[Transaction]:
         """Fetch all transactions from an account
 
+        The first page tells how many pages there are, the remaining pages
+        are then requested concurrently.
+
+        Parameters
+        ----------
+        * account_id (str): The account id
+        * concurrency (int): Maximum number of pages requested at the same time
+        * options (TransactionFilters): Transaction options to filter
+
+        Returns
+        -------
+        * list: An array of transactions, in page order
+        """
+        return await self.paginate(
+            self.fetch_transactions,
+            account_id,
+            options={'pageSize': MAX_PAGE_SIZE, **options},
+            concurrency=concurrency,
+        ).collect()
+
+    async def iter_transaction_pages(
+        self,
+        account_id: str,
+        options: TransactionFilters = {},
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> AsyncIterator[PageResponse]:
+        """Iterate over the transaction pages of an account as they arrive
+
+        Up to `prefetch` pages are downloaded ahead while the current one is
+        being consumed, which bounds memory to `prefetch + 1` pages.
+
+        Parameters
+        ----------
+        * account_id (str): The account id
+        * options (TransactionFilters): Transaction options to filter
+        * prefetch (int): Number of pages downloaded ahead of the consumer
+
+        Returns
+        -------
+        * AsyncIterator[PageResponse]: The pages of transactions, in page order
+        """
+        async for page in self.paginate(
+            self.fetch_transactions,
+            account_id,
+            options={'pageSize': MAX_PAGE_SIZE, **options},
+        ).pages(prefetch):
+            yield page
+
+    async def iter_transactions(
+        self,
+        account_id: str,
+        options: TransactionFilters = {},
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> AsyncIterator[Transaction]:
+        """Iterate over the transactions of an account, one at a time
+
+        Parameters
+        ----------
+        * account_id (str): The account id
+        * options (TransactionFilters): Transaction options to filter
+        * prefetch (int): Number of pages downloaded ahead of the consumer
+
+        Returns
+        -------
+        * AsyncIterator[Transaction]: The transactions, in page order
+        """
+        async for page in self.iter_transaction_pages(
+            account_id, options, prefetch
+        ):
+            for transaction in page['results']:
+                yield transaction
+
+    async def sync_transactions(
+        self,
+        account_id: str,
+        cursor: Optional[TransactionSyncCursor] = None,
+        overlap: timedelta = DEFAULT_SYNC_OVERLAP,
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> TransactionSyncResult:
+        """Fetch the transactions of an account that changed since the last sync
+
+        Only transactions dated from the cursor's high-water mark minus
+        `overlap` are fetched. Those that are new or changed are returned as
+        upserts, and those that vanished from that window, ie. a PENDING
+        transaction replaced once POSTED, are returned as tombstones.
+
         Parameters
         ----------
         * account_id (str): The account id
+        * cursor (Optional[TransactionSyncCursor]): Cursor returned by the previous sync.
+        If none submitted, the whole history is fetched.
+        * overlap (timedelta): How far behind the high-water mark to look again
+        * concurrency (int): Maximum number of pages requested at the same time
 
         Returns
         -------
-        * list: An array of transactions
+        * TransactionSyncResult: Upserts, tombstones and the cursor for the next sync
         """
-        MAX_PAGE_SIZE = 500
+        cursor = cursor or TransactionSyncCursor(account_id)
+        window_start = None
+        options: TransactionFilters = {}
 
-        result = await self.fetch_transactions(
-            account_id, options={'pageSize': MAX_PAGE_SIZE}
+        if cursor.high_water_mark is not None:
+            window_start = get_window_start(cursor.high_water_mark, overlap)
+            options = {'from_': window_start}
+
+        transactions = await self.fetch_all_transactions(
+            account_id, concurrency, options
         )
 
-        if result['totalPages'] == 1:
-            return result['results']
+        return diff_transactions(cursor, transactions, window_start, overlap)
 
-        else:
-            transactions: list = []
-            page = 1
+    async def backfill_transactions(
+        self,
+        account_id: str,
+        from_date: date,
+        to_date: Optional[date] = None,
+        window: timedelta = DEFAULT_BACKFILL_WINDOW,
+        max_window_pages: int = DEFAULT_MAX_WINDOW_PAGES,
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> list[Transaction]:
+        """Fetch an account history in date windows fetched in parallel
 
-            while page <= result['totalPages']:
-                print("current_page", page)
-                paginated_transaction = await self.fetch_transactions(
-                    account_id, options={'page': page, 'pageSize':MAX_PAGE_SIZE}
-                )
-                transactions.extend(paginated_transaction['results'])
-                page += 1
+        Windows holding more than `max_window_pages` pages are split in two
+        until they are small enough, so no single deep pagination holds the
+        backfill back. Transactions are merged without duplicates.
 
-            return transactions
+        Parameters
+        ----------
+        * account_id (str): The account id
+        * from_date (date): First date of the history to fetch
+        * to_date (Optional[date]): Last date of the history to fetch, defaults to today
+        * window (timedelta): Span of the initial date windows
+        * max_window_pages (int): Windows with more pages than this are split in two
+        * concurrency (int): Maximum number of requests sent at the same time
+
+        Returns
+        -------
+        * list[Transaction]: The transactions, sorted by date
+        """
+        return await backfill_transactions(
+            self,
+            account_id,
+            from_date,
+            to_date or date.today(),
+            window,
+            max_window_pages,
+            concurrency,
+        )
 
     async def update_transaction_category(
         self, id: str, category_id: str
@@ -240,7 +490,7 @@ class PluggyClient(BaseApi):
     async def fetch_investments(
         self,
         item_id: str,
-        type: InvestmentType,
+        type: Optional[InvestmentType] = None,
         options: InvestmentsFilters = {},
     ) -> PageResponse:
         """Fetch Investments from an Item
@@ -248,6 +498,8 @@ class PluggyClient(BaseApi):
         Parameters
         ----------
         * item_id (str): The Item Id
+        * type (Optional[InvestmentType]): Only fetch investments of this type
+        * options (InvestmentsFilters): Request search filters
 
         Returns
         -------
@@ -255,9 +507,37 @@ class PluggyClient(BaseApi):
         """
         return await self.create_get_request(
             'investments',
-            {'options': options, 'itemId': item_id, 'type': type},
+            {**options, 'itemId': item_id, 'type': type},
         )
 
+    async def fetch_all_investments(
+        self,
+        item_id: str,
+        type: Optional[InvestmentType] = None,
+        options: InvestmentsFilters = {},
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> list[Investment]:
+        """Fetch the investments of every page from an Item
+
+        Parameters
+        ----------
+        * item_id (str): The Item Id
+        * type (Optional[InvestmentType]): Only fetch investments of this type
+        * options (InvestmentsFilters): Request search filters
+        * concurrency (int): Maximum number of pages requested at the same time
+
+        Returns
+        -------
+        * list[Investment]: The investments, in page order
+        """
+        return await self.paginate(
+            self.fetch_investments,
+            item_id,
+            type,
+            options=options,
+            concurrency=concurrency,
+        ).collect()
+
     async def fetch_investment(self, id: str) -> Investment:
         """Fetch a single investment
 
@@ -287,9 +567,34 @@ class PluggyClient(BaseApi):
         """
         return await self.create_get_request(
             f'investments/{investment_id}/transactions',
-            {'options': options, 'investmentId': investment_id},
+            {**options, 'investmentId': investment_id},
         )
 
+    async def fetch_all_investment_transactions(
+        self,
+        investment_id: str,
+        options: TransactionFilters = {},
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> list[InvestmentTransaction]:
+        """Fetch the transactions of every page from an investment
+
+        Parameters
+        ----------
+        * investment_id (str): The investment id
+        * options (TransactionFilters): Transaction options to filter
+        * concurrency (int): Maximum number of pages requested at the same time
+
+        Returns
+        -------
+        * list[InvestmentTransaction]: The transactions, in page order
+        """
+        return await self.paginate(
+            self.fetch_investment_transactions,
+            investment_id,
+            options=options,
+            concurrency=concurrency,
+        ).collect()
+
     async def fetch_opportunities(
         self, item_id: str, options: OpportunityFilters = {}
     ) -> PageResponse:
@@ -305,9 +610,34 @@ class PluggyClient(BaseApi):
         * PageResponse: Paged response of opportunities
         """
         return await self.create_get_request(
-            'opportunities', {'options': options, 'itemId': item_id}
+            'opportunities', {**options, 'itemId': item_id}
         )
 
+    async def fetch_all_opportunities(
+        self,
+        item_id: str,
+        options: OpportunityFilters = {},
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> list[Opportunity]:
+        """Fetch the opportunities of every page from an Item
+
+        Parameters
+        ----------
+        * item_id (str): The Item id
+        * options (OpportunityFilters): Request search filters
+        * concurrency (int): Maximum number of pages requested at the same time
+
+        Returns
+        -------
+        * list[Opportunity]: The opportunities, in page order
+        """
+        return await self.paginate(
+            self.fetch_opportunities,
+            item_id,
+            options=options,
+            concurrency=concurrency,
+        ).collect()
+
     async def fetch_loans(
         self, item_id: str, options: PageFilters = {}
     ) -> PageResponse:
@@ -323,9 +653,31 @@ class PluggyClient(BaseApi):
         * PageResponse: Paged response of loans
         """
         return await self.create_get_request(
-            'loans', {'options': options, 'itemId': item_id}
+            'loans', {**options, 'itemId': item_id}
         )
 
+    async def fetch_all_loans(
+        self,
+        item_id: str,
+        options: PageFilters = {},
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> list[Loan]:
+        """Fetch the loans of every page from an Item
+
+        Parameters
+        ----------
+        * item_id (str): The Item id
+        * options (PageFilters): Request search filters
+        * concurrency (int): Maximum number of pages requested at the same time
+
+        Returns
+        -------
+        * list[Loan]: The loans, in page order
+        """
+        return await self.paginate(
+            self.fetch_loans, item_id, options=options, concurrency=concurrency
+        ).collect()
+
     async def fetch_loan(self, id: str) -> Loan:
         """Fetch loan by id
 
@@ -385,14 +737,35 @@ class PluggyClient(BaseApi):
         """
         return await self.create_get_request(f'categories/{id}')
 
-    async def fetch_webhooks(self) -> PageResponse:
+    async def fetch_webhooks(self, options: PageFilters = {}) -> PageResponse:
         """Fetch all available webhooks
 
+        Parameters
+        ----------
+        * options (PageFilters): Request paging filters
+
         Returns
         -------
         * PageResponse[Webhook]: A paging response of webhooks
         """
-        return await self.create_get_request('webhooks')
+        return await self.create_get_request('webhooks', options)
+
+    async def fetch_all_webhooks(
+        self, concurrency: int = DEFAULT_PAGE_CONCURRENCY
+    ) -> list[Webhook]:
+        """Fetch the webhooks of every page
+
+        Parameters
+        ----------
+        * concurrency (int): Maximum number of pages requested at the same time
+
+        Returns
+        -------
+        * list[Webhook]: The webhooks, in page order
+        """
+        return await self.paginate(
+            self.fetch_webhooks, concurrency=concurrency
+        ).collect()
 
     async def fetch_webhook(self, id: str) -> Webhook:
         """Fetch a single webhook
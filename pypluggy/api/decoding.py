@@ -0,0 +1,230 @@
+import dataclasses
+import datetime
+import enum
+import types
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Literal,
+    Optional,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from .transforms import parse_date_cached, parse_datetime_cached
+
+T = TypeVar('T')
+
+Decoder = Callable[[Any], Any]
+
+# Decoders already built, by type. None means the value is kept as is
+decoders: dict[Any, Optional[Decoder]] = {}
+
+
+def build_enum_decoder(enum_type: type[enum.Enum]) -> Decoder:
+    # Members are matched by value, then by name, since several enums use
+    # `auto()` values while the API sends their names. Unknown values are
+    # kept as is, so a new value on the API side doesn't break decoding.
+    members: dict[Any, enum.Enum] = {
+        member.name: member for member in enum_type
+    }
+    members.update(
+        (member.value, member)
+        for member in enum_type
+        if isinstance(member.value, (str, int))
+    )
+    get = members.get
+
+    def decode_enum(value: Any) -> Any:
+        return get(value, value)
+
+    return decode_enum
+
+
+def build_list_decoder(item_decoder: Decoder) -> Decoder:
+    def decode_list(values: Any) -> Any:
+        return [
+            None if value is None else item_decoder(value) for value in values
+        ]
+
+    return decode_list
+
+
+def get_field_key(field: dataclasses.Field) -> str:
+    """Key of a dataclass field in the JSON objects"""
+    # Fields such as `from_` avoid Python keywords, the API sends `from`
+    return field.name.rstrip('_') or field.name
+
+
+def build_dataclass_decoder(cls: type) -> Decoder:
+    """Generates the source of a function building `cls` from a dict, with
+    one line per field, so decoding doesn't inspect the annotations again.
+
+    Missing keys are decoded as None, or as the field default, and keys the
+    dataclass doesn't know about are ignored.
+    """
+    hints = get_type_hints(cls)
+    namespace: dict[str, Any] = {'cls': cls, 'MISSING': dataclasses.MISSING}
+    arguments = []
+
+    for index, field in enumerate(dataclasses.fields(cls)):
+        if not field.init:
+            continue
+
+        key = get_field_key(field)
+        if field.default is not dataclasses.MISSING:
+            namespace[f'default_{index}'] = field.default
+            value = f'get({key!r}, default_{index})'
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f'factory_{index}'] = field.default_factory
+            value = (
+                f'(value if (value := get({key!r}, MISSING)) '
+                f'is not MISSING else factory_{index}())'
+            )
+        else:
+            value = f'get({key!r})'
+
+        decoder = get_decoder(hints[field.name])
+        if decoder is not None:
+            namespace[f'decode_{index}'] = decoder
+            value = (
+                f'(None if (value := {value}) is None '
+                f'else decode_{index}(value))'
+            )
+
+        arguments.append(f'        {field.name}={value},')
+
+    source = '\n'.join(
+        [
+            'def decode(data):',
+            '    get = data.get',
+            '    return cls(',
+            *arguments,
+            '    )',
+        ]
+    )
+    exec(
+        compile(source, f'<decoder {cls.__module__}.{cls.__name__}>', 'exec'),
+        namespace,
+    )
+    return namespace['decode']
+
+
+def get_union_arguments(annotation: Any) -> Optional[list[Any]]:
+    """Returns the members of a Union annotation other than None
+
+    Parameters
+    ----------
+    * annotation (Any): Any annotation, ie. `Optional[int]` or `int | str`
+
+    Returns
+    -------
+    * Optional[list[Any]]: The members, ie. `[int]`, None if not a Union
+    """
+    if get_origin(annotation) not in (Union, types.UnionType):
+        return None
+    return [
+        argument
+        for argument in get_args(annotation)
+        if argument is not type(None)
+    ]
+
+
+def build_decoder(type_: Any) -> Optional[Decoder]:
+    if type_ is datetime.datetime:
+        return parse_datetime_cached
+    if type_ is datetime.date:
+        return parse_date_cached
+    if isinstance(type_, type) and issubclass(type_, enum.Enum):
+        return build_enum_decoder(type_)
+    if dataclasses.is_dataclass(type_) and isinstance(type_, type):
+        return build_dataclass_decoder(type_)
+
+    arguments = get_union_arguments(type_)
+    if arguments is not None:
+        # Only `Optional[X]` can be decoded without guessing the type
+        if len(arguments) == 1:
+            return get_decoder(arguments[0])
+        return None
+
+    origin = get_origin(type_)
+    if origin is list:
+        arguments = get_args(type_)
+        item_decoder = get_decoder(arguments[0]) if arguments else None
+        if item_decoder is None:
+            return None
+        return build_list_decoder(item_decoder)
+    if origin is Literal:
+        return None
+
+    # str, int, float, bool, dict and Any are kept as is
+    return None
+
+
+def get_decoder(type_: Any) -> Optional[Decoder]:
+    """Returns the decoder of a type, building it on first use
+
+    Parameters
+    ----------
+    * type_ (Any): A dataclass from `pypluggy.api.type`, or any annotation used by one
+
+    Returns
+    -------
+    * Optional[Decoder]: Function converting a JSON value to the type, None if the
+    value needs no conversion
+    """
+    try:
+        return decoders[type_]
+    except KeyError:
+        pass
+
+    # Dataclasses referring to themselves get a decoder that looks up the
+    # real one once it's built
+    decoders[type_] = lambda value: decoders[type_](value)
+    try:
+        decoder = build_decoder(type_)
+    except BaseException:
+        del decoders[type_]
+        raise
+
+    decoders[type_] = decoder
+    return decoder
+
+
+def decode(cls: type[T], data: Any) -> T:
+    """Converts a JSON response to an instance of a dataclass, decoding nested
+    dataclasses, enums and dates
+
+    Parameters
+    ----------
+    * cls (type[T]): A dataclass from `pypluggy.api.type`, ie. `Transaction`
+    * data (Any): The response, as returned by the client methods
+
+    Returns
+    -------
+    * T: The typed object
+    """
+    decoder = get_decoder(cls)
+    return data if decoder is None else decoder(data)
+
+
+def decode_many(cls: type[T], items: Iterable[Any]) -> list[T]:
+    """Converts a list of JSON objects, ie. the `results` of a page
+
+    Parameters
+    ----------
+    * cls (type[T]): A dataclass from `pypluggy.api.type`, ie. `Transaction`
+    * items (Iterable[Any]): The objects, as returned by the client methods
+
+    Returns
+    -------
+    * list[T]: The typed objects
+    """
+    decoder = get_decoder(cls)
+    if decoder is None:
+        return list(items)
+    return [decoder(item) for item in items]
@@ -0,0 +1,137 @@
+import dataclasses
+from typing import Any, Iterable, Optional, get_type_hints
+
+from pypluggy.api.type.transaction import Transaction
+
+from .decoding import Decoder, decode, get_decoder, get_field_key
+
+# Lazy record types already built, by dataclass
+lazy_types: dict[type, type] = {}
+
+
+class LazyField:
+    """Reads a field from the raw object, decoding it on first access and
+    keeping the result in a slot of the record"""
+
+    __slots__ = ('key', 'decoder', 'slot')
+
+    def __init__(self, key: str, decoder: Optional[Decoder], slot: Any):
+        self.key = key
+        self.decoder = decoder
+        self.slot = slot
+
+    def __get__(self, record: Any, owner: Optional[type] = None) -> Any:
+        if record is None:
+            return self
+        if self.decoder is None:
+            return record._raw.get(self.key)
+
+        try:
+            return self.slot.__get__(record)
+        except AttributeError:
+            value = record._raw.get(self.key)
+            if value is not None:
+                value = self.decoder(value)
+            self.slot.__set__(record, value)
+            return value
+
+
+class LazyRecord:
+    """Read-only view over an object of the API, with the attributes of a
+    dataclass from `pypluggy.api.type`. Build one with `lazy`.
+
+    Its own members are underscored, so they can't clash with the fields
+    of the dataclass, ie. `WebhookEventPayload.data`.
+    """
+
+    __slots__ = ('_raw',)
+
+    # The dataclass the record stands for
+    _record_type: type
+
+    def __init__(self, data: dict[str, Any]):
+        self._raw = data
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self._raw!r})'
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._raw == other._raw
+
+    __hash__ = None  # type: ignore
+
+    def materialize(self) -> Any:
+        """Decodes every field, returning an instance of the dataclass"""
+        return decode(self._record_type, self._raw)
+
+
+def lazy(cls: type) -> type:
+    """Builds a `LazyRecord` type with the fields of a dataclass
+
+    Fields are read from the raw object on access. Dates, enums and nested
+    dataclasses are decoded the first time they are read and cached, so
+    reading a few fields of many records only pays for those fields.
+
+    Parameters
+    ----------
+    * cls (type): A dataclass from `pypluggy.api.type`, ie. `Transaction`
+
+    Returns
+    -------
+    * type: The lazy record type, named `Lazy{name}`
+    """
+    if cls in lazy_types:
+        return lazy_types[cls]
+
+    hints = get_type_hints(cls)
+    for field in dataclasses.fields(cls):
+        if hasattr(LazyRecord, field.name):
+            raise ValueError(
+                f'Field {field.name!r} of {cls.__name__} clashes with a '
+                'member of LazyRecord'
+            )
+    fields = {
+        field.name: (get_field_key(field), get_decoder(hints[field.name]))
+        for field in dataclasses.fields(cls)
+    }
+
+    lazy_type = type(
+        f'Lazy{cls.__name__}',
+        (LazyRecord,),
+        {
+            '__slots__': tuple(
+                f'decoded_{name}'
+                for name, (_, decoder) in fields.items()
+                if decoder is not None
+            ),
+            '__module__': __name__,
+            '_record_type': cls,
+        },
+    )
+    for name, (key, decoder) in fields.items():
+        slot = lazy_type.__dict__.get(f'decoded_{name}')
+        setattr(lazy_type, name, LazyField(key, decoder, slot))
+
+    lazy_types[cls] = lazy_type
+    return lazy_type
+
+
+def lazy_many(cls: type, items: Iterable[dict[str, Any]]) -> list[Any]:
+    """Wraps a list of objects of the API, ie. the `results` of a page
+
+    Parameters
+    ----------
+    * cls (type): A dataclass from `pypluggy.api.type`, ie. `Transaction`
+    * items (Iterable[dict[str, Any]]): The objects, as returned by the client methods
+
+    Returns
+    -------
+    * list[Any]: The lazy records
+    """
+    lazy_type = lazy(cls)
+    return [lazy_type(item) for item in items]
+
+
+LazyTransaction = lazy(Transaction)
@@ -0,0 +1,175 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from pypluggy.api.type.common import PageResponse
+
+from .utils import gather_or_cancel
+
+# Largest page size accepted by the API
+MAX_PAGE_SIZE = 500
+# Default number of pages downloaded ahead of the consumer
+DEFAULT_PREFETCH = 2
+# Default number of pages requested at the same time
+DEFAULT_PAGE_CONCURRENCY = 8
+
+PageFetcher = Callable[[int], Awaitable[PageResponse]]
+
+
+async def iterate_pages(
+    fetch_page: PageFetcher,
+    prefetch: int = DEFAULT_PREFETCH,
+    first_page: Optional[PageResponse] = None,
+    last_page: Optional[int] = None,
+) -> AsyncIterator[PageResponse]:
+    """Yields every page of a paged endpoint, in page order
+
+    While the consumer handles a page, up to `prefetch` following pages are
+    downloaded. No more are requested until the consumer asks for the next
+    one, so at most `prefetch + 1` pages are held in memory at once.
+
+    Pending downloads are cancelled when the iterator is closed, wrap it in
+    `contextlib.aclosing` when breaking out of the loop early.
+
+    Parameters
+    ----------
+    * fetch_page (PageFetcher): Coroutine function that fetches a page by its number
+    * prefetch (int): Number of pages downloaded ahead of the consumer
+    * first_page (Optional[PageResponse]): The first page, if already fetched
+    * last_page (Optional[int]): Stop at this page instead of the last one
+
+    Returns
+    -------
+    * AsyncIterator[PageResponse]: The pages, starting at page 1
+    """
+    if prefetch < 1:
+        raise ValueError('prefetch must be greater than zero')
+
+    page = first_page if first_page is not None else await fetch_page(1)
+    total_pages = page['totalPages']
+    if last_page is not None:
+        total_pages = min(total_pages, last_page)
+    next_page = 2
+    pending: deque[asyncio.Future] = deque()
+
+    try:
+        while True:
+            while next_page <= total_pages and len(pending) < prefetch:
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+
+            yield page
+
+            if not pending:
+                return
+
+            page = await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class Paginator:
+    """Fetches the pages of any `PageResponse` endpoint concurrently.
+
+    The first page tells how many pages there are, the following ones are
+    requested at most `concurrency` at a time. Results can be collected
+    at once, streamed in page order or streamed as pages arrive. Breaking
+    out of a stream, or setting `max_pages`, stops requesting pages.
+
+    Parameters
+    ----------
+    * fetch_page (PageFetcher): Coroutine function that fetches a page by its number
+    * concurrency (int): Maximum number of pages requested at the same time
+    * max_pages (Optional[int]): Stop after this many pages
+    * semaphore (Optional[asyncio.Semaphore]): Shared semaphore bounding the requests,
+    used instead of `concurrency` to put several paginators under a single cap
+    """
+
+    def __init__(
+        self,
+        fetch_page: PageFetcher,
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+        max_pages: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError('concurrency must be greater than zero')
+
+        self.fetch_page = fetch_page
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.semaphore = semaphore or asyncio.Semaphore(concurrency)
+
+    async def fetch(self, page: int) -> PageResponse:
+        async with self.semaphore:
+            return await self.fetch_page(page)
+
+    def get_last_page(self, first_page: PageResponse) -> int:
+        if self.max_pages is None:
+            return first_page['totalPages']
+        return min(first_page['totalPages'], self.max_pages)
+
+    async def collect(
+        self, first_page: Optional[PageResponse] = None
+    ) -> list[Any]:
+        """Fetches every page and returns their results, in page order.
+        Pass `first_page` if it was already fetched."""
+        if first_page is None:
+            first_page = await self.fetch(1)
+        last_page = self.get_last_page(first_page)
+
+        pages = await gather_or_cancel(
+            self.fetch(page) for page in range(2, last_page + 1)
+        )
+
+        results = list(first_page['results'])
+        for page in pages:
+            results.extend(page['results'])
+
+        return results
+
+    async def pages(
+        self, prefetch: Optional[int] = None
+    ) -> AsyncIterator[PageResponse]:
+        """Yields the pages in page order, `prefetch` pages ahead of the
+        consumer, defaulting to `concurrency`"""
+        first_page = await self.fetch(1)
+
+        async for page in iterate_pages(
+            self.fetch,
+            prefetch or self.concurrency,
+            first_page,
+            self.get_last_page(first_page),
+        ):
+            yield page
+
+    async def as_completed(self) -> AsyncIterator[PageResponse]:
+        """Yields the pages as soon as they arrive, in any order
+
+        Every page is requested upfront, so pages the consumer hasn't read
+        yet pile up in memory. Use `pages` to bound it.
+        """
+        first_page = await self.fetch(1)
+
+        tasks = [
+            asyncio.ensure_future(self.fetch(page))
+            for page in range(2, self.get_last_page(first_page) + 1)
+        ]
+
+        try:
+            yield first_page
+
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def results(
+        self, prefetch: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """Yields the results of every page one at a time, in page order"""
+        async for page in self.pages(prefetch):
+            for result in page['results']:
+                yield result
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from typing import Optional
+
+from .utils import endpoint_family
+
+# Requests per second allowed for each endpoint family
+DEFAULT_RATES = {
+    'auth': 1.0,
+    'items': 5.0,
+    'transactions': 10.0,
+    'default': 10.0,
+}
+
+
+class TokenBucket:
+    """Async token bucket, refilled continuously at `rate` tokens per second.
+
+    Waiters are served in arrival order, so a burst of callers is spread
+    evenly over time instead of retrying against each other.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError('rate must be greater than zero')
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Waits until `tokens` are available and takes them"""
+        if tokens > self.capacity:
+            raise ValueError('Cannot acquire more tokens than the capacity')
+
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+
+class RateLimiter:
+    """Client side rate limiter with one token bucket per endpoint family.
+
+    Pass the same instance to every client that shares API credentials so
+    their combined request rate stays under the server limit.
+
+    Parameters
+    ----------
+    * rates (Optional[dict[str, float]]): Requests per second by endpoint family,
+    ie. `{'transactions': 8}`. Families not listed use the `default` rate.
+    * burst (Optional[float]): How many seconds worth of requests can be sent at once.
+    Defaults to one second.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[dict[str, float]] = None,
+        burst: float = 1.0,
+    ):
+        self.rates = {**DEFAULT_RATES, **(rates or {})}
+        self.buckets = {
+            family: TokenBucket(rate, capacity=max(1.0, rate * burst))
+            for family, rate in self.rates.items()
+        }
+
+    def get_bucket(self, endpoint: str) -> TokenBucket:
+        family = endpoint_family(endpoint)
+        return self.buckets.get(family, self.buckets['default'])
+
+    async def acquire(self, endpoint: str) -> None:
+        """Waits for a slot to send a request to `endpoint`"""
+        await self.get_bucket(endpoint).acquire()
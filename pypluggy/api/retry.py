@@ -0,0 +1,127 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+# Methods that can be sent twice without changing the result
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+# Responses worth retrying: rate limited or transient server failures
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Reads the `Retry-After` header of a response
+
+    Parameters
+    ----------
+    * response (httpx.Response): The response to read the header from
+
+    Returns
+    -------
+    * Optional[float]: Seconds to wait, None if the header is missing or invalid
+    """
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+        return max(0.0, retry_at - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """Retries failed requests with exponential backoff and full jitter.
+
+    Subclass it and override `should_retry` or `get_delay` to plug in a
+    different strategy, or use `RetryPolicy(max_attempts=1)` to disable it.
+    """
+
+    # Maximum number of attempts per call, including the first one
+    max_attempts: int = 4
+    # Delay cap of the first retry, doubled on every following one
+    backoff_base: float = 0.5
+    # Delay cap of any single retry
+    backoff_max: float = 30.0
+    # Total time a single call may spend waiting between attempts
+    budget: float = 60.0
+    # Methods that are retried, only idempotent ones by default
+    retry_methods: frozenset[str] = IDEMPOTENT_METHODS
+    # Response status codes that are retried
+    retry_status_codes: frozenset[int] = RETRYABLE_STATUS_CODES
+    # Wait as long as the server asks to through the `Retry-After` header
+    respect_retry_after: bool = True
+
+    def should_retry(
+        self,
+        method: str,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> bool:
+        if method.upper() not in self.retry_methods:
+            return False
+        if error is not None:
+            return isinstance(error, httpx.TransportError)
+        return (
+            response is not None
+            and response.status_code in self.retry_status_codes
+        )
+
+    def get_delay(
+        self, attempt: int, response: Optional[httpx.Response] = None
+    ) -> float:
+        """Seconds to wait after the given failed attempt, starting at 1"""
+        if self.respect_retry_after and response is not None:
+            retry_after = parse_retry_after(response)
+            if retry_after is not None:
+                return retry_after
+
+        cap = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    async def run(
+        self, method: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Calls `send` until it succeeds or the retries are exhausted
+
+        The last response is returned as is when it can't be retried anymore,
+        so callers keep handling HTTP errors through `raise_for_status`.
+        Transport errors are raised once retries are exhausted.
+        """
+        waited = 0.0
+
+        for attempt in range(1, self.max_attempts + 1):
+            last_attempt = attempt == self.max_attempts
+
+            try:
+                response = await send()
+            except httpx.HTTPError as error:
+                if last_attempt or not self.should_retry(method, error=error):
+                    raise
+                delay = self.get_delay(attempt)
+                if waited + delay > self.budget:
+                    raise
+            else:
+                if last_attempt or not self.should_retry(
+                    method, response=response
+                ):
+                    return response
+                delay = self.get_delay(attempt, response)
+                if waited + delay > self.budget:
+                    return response
+
+            await asyncio.sleep(delay)
+            waited += delay
+
+        raise ValueError('max_attempts must be greater than zero')
@@ -0,0 +1,64 @@
+import importlib
+import importlib.util
+import json
+from typing import Any, Callable, Union
+
+JsonDecoder = Callable[[bytes], Any]
+
+# Decoder backends, fastest first. Each one decodes bytes directly.
+JSON_DECODERS = ['orjson', 'msgspec', 'json']
+
+
+def decode_with_json(content: bytes) -> Any:
+    # `json.loads` detects the encoding of bytes itself
+    return json.loads(content)
+
+
+def is_json_decoder_available(name: str) -> bool:
+    """Whether the package of a decoder backend is installed"""
+    return name == 'json' or importlib.util.find_spec(name) is not None
+
+
+def load_json_decoder(name: str) -> JsonDecoder:
+    if name == 'json':
+        return decode_with_json
+    if name == 'orjson':
+        return importlib.import_module('orjson').loads
+    if name == 'msgspec':
+        return importlib.import_module('msgspec.json').decode
+
+    raise ValueError(
+        f'Unknown JSON decoder {name!r}, use one of {", ".join(JSON_DECODERS)}'
+    )
+
+
+def get_json_decoder(
+    decoder: Union[str, JsonDecoder, None] = None
+) -> JsonDecoder:
+    """Resolves the JSON decoder used for response bodies
+
+    Parameters
+    ----------
+    * decoder (Union[str, JsonDecoder, None]): A function decoding bytes, the name of a
+    backend ('json', 'orjson' or 'msgspec'), 'auto' for the fastest one installed,
+    or None for the standard library
+
+    Returns
+    -------
+    * JsonDecoder: Function decoding the raw bytes of a response
+    """
+    if decoder is None:
+        return decode_with_json
+    if callable(decoder):
+        return decoder
+    if decoder == 'auto':
+        name = next(
+            name for name in JSON_DECODERS if is_json_decoder_available(name)
+        )
+        return load_json_decoder(name)
+
+    if decoder in JSON_DECODERS and not is_json_decoder_available(decoder):
+        raise ValueError(
+            f'JSON decoder {decoder!r} requires the {decoder!r} package'
+        )
+    return load_json_decoder(decoder)
@@ -0,0 +1,103 @@
+import importlib.util
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+
+@dataclass
+class SessionConfig:
+    """Connection pool and timeout settings of the sessions created by
+    `create_session`. Keep `max_connections` around the pagination
+    concurrency, with HTTP/2 a few connections carry many requests."""
+
+    # Use HTTP/2 multiplexing, None enables it when `h2` is installed
+    http2: Optional[bool] = None
+    # Maximum number of open connections
+    max_connections: int = 20
+    # Maximum number of idle connections kept open
+    max_keepalive_connections: int = 10
+    # Seconds an idle connection is kept open
+    keepalive_expiry: float = 30.0
+    # Seconds to wait for a connection to be established
+    connect_timeout: float = 5.0
+    # Seconds to wait for a chunk of the response
+    read_timeout: float = 30.0
+    # Seconds to wait for a chunk of the request to be sent
+    write_timeout: float = 10.0
+    # Seconds to wait for a free connection in the pool
+    pool_timeout: float = 10.0
+
+
+def is_http2_available() -> bool:
+    """Whether the `h2` package needed by httpx for HTTP/2 is installed"""
+    return importlib.util.find_spec('h2') is not None
+
+
+def create_session(
+    config: Optional[SessionConfig] = None,
+) -> httpx.AsyncClient:
+    """Creates an `httpx.AsyncClient` tuned for the Pluggy API
+
+    Parameters
+    ----------
+    * config (Optional[SessionConfig]): Pool and timeout settings, defaults to `SessionConfig()`
+
+    Returns
+    -------
+    * httpx.AsyncClient: A session to be reused across requests
+    """
+    config = config or SessionConfig()
+    http2 = config.http2
+    if http2 is None:
+        http2 = is_http2_available()
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=config.connect_timeout,
+            read=config.read_timeout,
+            write=config.write_timeout,
+            pool=config.pool_timeout,
+        ),
+    )
+
+
+def get_pool_stats(session: httpx.AsyncClient) -> dict[str, int]:
+    """Counts the connections currently held by a session's pool
+
+    Parameters
+    ----------
+    * session (httpx.AsyncClient): The session to inspect
+
+    Returns
+    -------
+    * dict[str, int]: Number of open, idle, active and HTTP/2 connections.
+    Empty when the session doesn't use the default httpx transport.
+    """
+    pool = getattr(getattr(session, '_transport', None), '_pool', None)
+    connections = getattr(pool, 'connections', None)
+
+    if connections is None:
+        return {}
+
+    open_connections = [
+        connection for connection in connections if not connection.is_closed()
+    ]
+    idle = sum(1 for connection in open_connections if connection.is_idle())
+
+    return {
+        'connections': len(open_connections),
+        'idle': idle,
+        'active': len(open_connections) - idle,
+        'http2': sum(
+            1
+            for connection in open_connections
+            if 'HTTP/2' in connection.info()
+        ),
+    }
@@ -0,0 +1,202 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+import httpx
+
+from pypluggy.api.type.account import Account
+from pypluggy.api.type.identity import IdentityResponse
+from pypluggy.api.type.income_report import IncomeReport
+from pypluggy.api.type.investment import Investment, InvestmentTransaction
+from pypluggy.api.type.item import Item
+from pypluggy.api.type.loans import Loan
+from pypluggy.api.type.opportunity import Opportunity
+from pypluggy.api.type.transaction import Transaction
+
+from .pagination import DEFAULT_PAGE_CONCURRENCY, MAX_PAGE_SIZE
+from .utils import gather_or_cancel
+
+if TYPE_CHECKING:
+    from .client import PluggyClient
+
+# Field of ItemProductsStatusDetail describing each product
+PRODUCT_STATUS_FIELDS = {
+    'ACCOUNTS': 'accounts',
+    'CREDIT_CARDS': 'creditCards',
+    'TRANSACTIONS': 'transactions',
+    'INVESTMENTS': 'investments',
+    'INVESTMENTS_TRANSACTIONS': 'investmentTransactions',
+    'IDENTITY': 'identity',
+    'INCOME_REPORTS': 'incomeReports',
+    'LOANS': 'loans',
+    'OPPORTUNITIES': 'opportunities',
+}
+
+
+@dataclass
+class ItemSnapshot:
+    """Everything collected for an Item, fetched by `fetch_item_snapshot`.
+    Products that were not collected are left empty."""
+
+    item: Item
+    accounts: list[Account] = field(default_factory=list)
+    # Transactions by account id
+    transactions: dict[str, list[Transaction]] = field(default_factory=dict)
+    investments: list[Investment] = field(default_factory=list)
+    # Transactions by investment id
+    investment_transactions: dict[str, list[InvestmentTransaction]] = field(
+        default_factory=dict
+    )
+    loans: list[Loan] = field(default_factory=list)
+    identity: Optional[IdentityResponse] = None
+    opportunities: list[Opportunity] = field(default_factory=list)
+    income_reports: list[IncomeReport] = field(default_factory=list)
+
+
+def has_product(item: Item, product: str) -> bool:
+    """Whether a product was requested for an Item and collected at least once
+
+    Parameters
+    ----------
+    * item (Item): The Item, as returned by the API
+    * product (str): A ProductType value, ie. 'TRANSACTIONS'
+
+    Returns
+    -------
+    * bool: False if the product is known to be missing, True otherwise
+    """
+    products = item.get('products')
+    if products is not None and product not in products:
+        return False
+
+    status_detail = item.get('statusDetail')
+    if status_detail is None or product not in PRODUCT_STATUS_FIELDS:
+        return True
+
+    state = status_detail.get(PRODUCT_STATUS_FIELDS[product])
+    if state is None:
+        return False
+
+    return bool(state.get('isUpdated') or state.get('lastUpdatedAt'))
+
+
+async def fetch_item_snapshot(
+    client: 'PluggyClient',
+    item_id: str,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+) -> ItemSnapshot:
+    """Fetches every product of an Item, running independent requests
+    concurrently under a single cap
+
+    The Item is fetched first to learn which products were collected. Then
+    accounts, investments, loans, identity, opportunities and income reports
+    are fetched at the same time, each account's transactions as soon as the
+    accounts arrive and each investment's transactions as soon as the
+    investments do.
+
+    Parameters
+    ----------
+    * client (PluggyClient): The client used to fetch the products
+    * item_id (str): The Item id
+    * concurrency (int): Maximum number of requests sent at the same time
+
+    Returns
+    -------
+    * ItemSnapshot: The Item and all of its collected products
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(method: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        async with semaphore:
+            return await method(*args)
+
+    async def fetch_all(
+        method: Callable[..., Awaitable[Any]],
+        *args: Any,
+        options: dict[str, Any] = {},
+    ) -> list[Any]:
+        return await client.paginate(
+            method, *args, options=options, semaphore=semaphore
+        ).collect()
+
+    snapshot = ItemSnapshot(item=await fetch(client.fetch_item, item_id))
+    item = snapshot.item
+
+    async def fetch_accounts() -> None:
+        response = await fetch(client.fetch_accounts, item_id)
+        snapshot.accounts = response['results']
+
+        if has_product(item, 'TRANSACTIONS'):
+            results = await gather_or_cancel(
+                fetch_all(
+                    client.fetch_transactions,
+                    account['id'],
+                    options={'pageSize': MAX_PAGE_SIZE},
+                )
+                for account in snapshot.accounts
+            )
+            snapshot.transactions = {
+                account['id']: transactions
+                for account, transactions in zip(snapshot.accounts, results)
+            }
+
+    async def fetch_investments() -> None:
+        snapshot.investments = await fetch_all(
+            client.fetch_investments, item_id, None
+        )
+
+        if has_product(item, 'INVESTMENTS_TRANSACTIONS'):
+            results = await gather_or_cancel(
+                fetch_all(
+                    client.fetch_investment_transactions,
+                    investment['id'],
+                    options={'pageSize': MAX_PAGE_SIZE},
+                )
+                for investment in snapshot.investments
+            )
+            snapshot.investment_transactions = {
+                investment['id']: transactions
+                for investment, transactions in zip(
+                    snapshot.investments, results
+                )
+            }
+
+    async def fetch_loans() -> None:
+        snapshot.loans = await fetch_all(client.fetch_loans, item_id)
+
+    async def fetch_identity() -> None:
+        try:
+            snapshot.identity = await fetch(
+                client.fetch_identity_by_item_id, item_id
+            )
+        except httpx.HTTPStatusError as error:
+            # Items without identity data answer with a 404
+            if error.response.status_code != 404:
+                raise
+
+    async def fetch_opportunities() -> None:
+        snapshot.opportunities = await fetch_all(
+            client.fetch_opportunities, item_id
+        )
+
+    async def fetch_income_reports() -> None:
+        response = await fetch(client.fetch_income_reports, item_id)
+        snapshot.income_reports = response['results']
+
+    branches = []
+    if has_product(item, 'ACCOUNTS') or has_product(item, 'CREDIT_CARDS'):
+        branches.append(fetch_accounts())
+    if has_product(item, 'INVESTMENTS'):
+        branches.append(fetch_investments())
+    if has_product(item, 'LOANS'):
+        branches.append(fetch_loans())
+    if has_product(item, 'IDENTITY'):
+        branches.append(fetch_identity())
+    if has_product(item, 'OPPORTUNITIES'):
+        branches.append(fetch_opportunities())
+    if has_product(item, 'INCOME_REPORTS'):
+        branches.append(fetch_income_reports())
+
+    await gather_or_cancel(branches)
+
+    return snapshot
@@ -0,0 +1,87 @@
+import json
+import sqlite3
+import time
+from typing import Any, Iterable, Optional
+
+from .cache import CacheEntry, ResponseCache
+
+# Seconds an expired entry is still served while it is refreshed
+DEFAULT_STALE_WHILE_REVALIDATE = 7 * 24 * 60 * 60
+
+
+class SQLiteCache(ResponseCache):
+    """Response cache stored in a local SQLite file, kept across restarts.
+
+    New workers serve catalog data from the file right away. Expired entries
+    keep being served for `stale_while_revalidate` seconds while BaseApi
+    refreshes them in the background. Several processes can share the file.
+
+    Parameters
+    ----------
+    * path (str): Path of the SQLite database file
+    * ttls (Optional[dict[str, float]]): Seconds to keep the responses of each endpoint family
+    * stale_while_revalidate (float): Seconds an expired entry is still served while refreshed
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttls: Optional[dict[str, float]] = None,
+        stale_while_revalidate: float = DEFAULT_STALE_WHILE_REVALIDATE,
+    ):
+        super().__init__(ttls, stale_while_revalidate)
+        self.path = path
+        self.connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)'
+        )
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        row = self.connection.execute(
+            'SELECT value, expires_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return CacheEntry(json.loads(row[0]), row[1])
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = None if ttl is None else time.time() + ttl
+        self.connection.execute(
+            'INSERT OR REPLACE INTO responses (key, value, expires_at) '
+            'VALUES (?, ?, ?)',
+            (key, json.dumps(value), expires_at),
+        )
+
+    def delete(self, key: str) -> None:
+        self.connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def keys(self) -> Iterable[str]:
+        return [
+            row[0]
+            for row in self.connection.execute('SELECT key FROM responses')
+        ]
+
+    def clear(self) -> None:
+        self.connection.execute('DELETE FROM responses')
+
+    def purge(self) -> None:
+        """Removes the entries too old to be served, even as stale"""
+        self.connection.execute(
+            'DELETE FROM responses WHERE expires_at < ?',
+            (time.time() - self.stale_while_revalidate,),
+        )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def stats(self) -> dict[str, int]:
+        (size,) = self.connection.execute(
+            'SELECT COUNT(*) FROM responses'
+        ).fetchone()
+        return {**super().stats(), 'size': size}
@@ -0,0 +1,132 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Optional
+
+from pypluggy.api.type.transaction import Transaction
+
+# How far behind the high-water mark each sync looks again, to catch
+# late-posted transactions and PENDING -> POSTED changes
+DEFAULT_SYNC_OVERLAP = timedelta(days=7)
+
+
+@dataclass
+class TransactionSyncCursor:
+    """Where the last incremental sync of an account stopped.
+
+    Persist it with `to_dict` between runs and restore it with `from_dict`.
+    """
+
+    # Primary identifier of the Account
+    account_id: str
+    # Date of the latest transaction synced, as 'YYYY-MM-DD'
+    high_water_mark: Optional[str] = None
+    # Date and fingerprint of the transactions inside the overlap window, by id
+    window: dict[str, list[str]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'account_id': self.account_id,
+            'high_water_mark': self.high_water_mark,
+            'window': self.window,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'TransactionSyncCursor':
+        return cls(
+            account_id=data['account_id'],
+            high_water_mark=data.get('high_water_mark'),
+            window=data.get('window') or {},
+        )
+
+
+@dataclass
+class TransactionSyncResult:
+    # New transactions and transactions that changed since the last sync
+    upserts: list[Transaction]
+    # Ids of transactions that disappeared from the overlap window
+    tombstones: list[str]
+    # Cursor to pass to the next sync
+    cursor: TransactionSyncCursor
+
+
+def get_transaction_date(transaction: Transaction) -> str:
+    """Returns the date of a transaction as 'YYYY-MM-DD'"""
+    return str(transaction['date'])[:10]
+
+
+def get_transaction_fingerprint(transaction: Transaction) -> str:
+    """Hashes a transaction so changes to any of its fields can be spotted"""
+    payload = json.dumps(transaction, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=12).hexdigest()
+
+
+def get_window_start(high_water_mark: str, overlap: timedelta) -> str:
+    return (date.fromisoformat(high_water_mark) - overlap).isoformat()
+
+
+def diff_transactions(
+    cursor: TransactionSyncCursor,
+    transactions: list[Transaction],
+    window_start: Optional[str],
+    overlap: timedelta = DEFAULT_SYNC_OVERLAP,
+) -> TransactionSyncResult:
+    """Compares the transactions fetched since `window_start` with the
+    ones the cursor saw, returning the changes and the next cursor
+
+    Parameters
+    ----------
+    * cursor (TransactionSyncCursor): Cursor of the previous sync
+    * transactions (list[Transaction]): Transactions dated from `window_start` on
+    * window_start (Optional[str]): First date fetched, None if the whole history was
+    * overlap (timedelta): Overlap window kept in the next cursor
+
+    Returns
+    -------
+    * TransactionSyncResult: Upserts, tombstones and the next cursor
+    """
+    fetched: dict[str, list[str]] = {}
+    upserts = []
+
+    for transaction in transactions:
+        entry = [
+            get_transaction_date(transaction),
+            get_transaction_fingerprint(transaction),
+        ]
+        fetched[transaction['id']] = entry
+
+        previous = cursor.window.get(transaction['id'])
+        if previous is None or previous[1] != entry[1]:
+            upserts.append(transaction)
+
+    tombstones = [
+        id
+        for id, (transaction_date, _) in cursor.window.items()
+        if id not in fetched
+        and (window_start is None or transaction_date >= window_start)
+    ]
+
+    dates = [entry[0] for entry in fetched.values()]
+    if cursor.high_water_mark is not None:
+        dates.append(cursor.high_water_mark)
+    high_water_mark = max(dates) if dates else None
+
+    window = {}
+    if high_water_mark is not None:
+        next_window_start = get_window_start(high_water_mark, overlap)
+        window = {
+            id: entry
+            for id, entry in fetched.items()
+            if entry[0] >= next_window_start
+        }
+
+    return TransactionSyncResult(
+        upserts=upserts,
+        tombstones=tombstones,
+        cursor=TransactionSyncCursor(
+            account_id=cursor.account_id,
+            high_water_mark=high_water_mark,
+            window=window,
+        ),
+    )
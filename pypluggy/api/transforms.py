@@ -1,14 +1,193 @@
 import datetime
 import json
-import re
+from functools import lru_cache
+from typing import Any, Callable, Iterable
 
-ISO_DATE_REGEXP = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$')
+# Keys holding dates in the objects of the API, see `pypluggy.api.type`
+DATE_FIELDS = frozenset(
+    [
+        'balanceCloseDate',
+        'balanceDueDate',
+        'birthDate',
+        'contractDate',
+        'createdAt',
+        'date',
+        'disabledAt',
+        'disbursementDates',
+        'dueDate',
+        'expiresAt',
+        'firstInstallmentDueDate',
+        'issueDate',
+        'lastUpdatedAt',
+        'nextAutoSyncAt',
+        'paidDate',
+        'purchaseDate',
+        'settlementDate',
+        'tradeDate',
+        'updatedAt',
+    ]
+)
 
+# Default number of distinct strings remembered by the `*_cached` parsers
+DEFAULT_DATE_MEMO_SIZE = 4096
 
-def deserialize_json_with_dates(json_string: str) -> object:
-    def custom_reviver(key, value):
-        if isinstance(value, str) and ISO_DATE_REGEXP.match(value):
-            return datetime.fromisoformat(value)
+UTC = datetime.timezone.utc
+
+
+def parse_datetime(value: Any) -> Any:
+    """Parses an ISO 8601 string, ie. '2024-01-31T10:00:00.000Z'
+
+    The layout sent by the API, `YYYY-MM-DDTHH:MM:SS.sssZ`, is sliced
+    directly. Other layouts go through `datetime.fromisoformat`.
+
+    Parameters
+    ----------
+    * value (Any): The string to parse, other values are returned as is
+
+    Returns
+    -------
+    * Any: The datetime, timezone aware when the string has an offset
+    """
+    if not isinstance(value, str):
+        return value
+
+    if (
+        len(value) == 24
+        and value[23] == 'Z'
+        and value[10] == 'T'
+        and value[19] == '.'
+    ):
+        return datetime.datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+            int(value[20:23]) * 1000,
+            UTC,
+        )
+
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.datetime.fromisoformat(value)
+
+
+def parse_date(value: Any) -> Any:
+    """Parses the date part of an ISO 8601 string, ie. '2024-01-31'"""
+    if not isinstance(value, str):
+        return value
+    return datetime.date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
+def parse_date_or_datetime(value: Any) -> Any:
+    """Parses 'YYYY-MM-DD' strings as dates and longer ones as datetimes"""
+    if isinstance(value, str) and len(value) == 10:
+        return parse_date(value)
+    return parse_datetime(value)
+
+
+# Transactions of a page share few distinct dates, so remembering the
+# parsed values skips most of the parsing. Dates are immutable, sharing
+# them between objects is safe.
+parse_datetime_cached = lru_cache(maxsize=DEFAULT_DATE_MEMO_SIZE)(
+    parse_datetime
+)
+parse_date_cached = lru_cache(maxsize=DEFAULT_DATE_MEMO_SIZE)(parse_date)
+parse_date_or_datetime_cached = lru_cache(maxsize=DEFAULT_DATE_MEMO_SIZE)(
+    parse_date_or_datetime
+)
+
+
+def get_date_converter(memo: bool = True) -> Callable[[Any], Any]:
+    """Returns a function parsing the value of a date key, a string or a
+    list of strings. Strings that are not dates are kept as is."""
+    parse = parse_date_or_datetime_cached if memo else parse_date_or_datetime
+
+    def parse_value(value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        try:
+            return parse(value)
+        except ValueError:
+            return value
+
+    def convert_date(value: Any) -> Any:
+        if isinstance(value, list):
+            return [parse_value(item) for item in value]
+        return parse_value(value)
+
+    return convert_date
+
+
+def convert_dates(
+    value: Any,
+    date_fields: Iterable[str] = DATE_FIELDS,
+    memo: bool = True,
+) -> Any:
+    """Returns a copy of a decoded JSON value with the strings under date
+    keys parsed, leaving the input untouched
+
+    Only the keys listed in `date_fields` are parsed, other strings are
+    never inspected. 'YYYY-MM-DD' strings become dates, timestamps become
+    datetimes.
+
+    Parameters
+    ----------
+    * value (Any): A decoded JSON value, ie. a page of transactions
+    * date_fields (Iterable[str]): Keys holding dates, defaults to the date fields of the API
+    * memo (bool): Remember the last parsed strings, faster when dates repeat
+
+    Returns
+    -------
+    * Any: The copy, with dates parsed
+    """
+    date_fields = (
+        date_fields
+        if isinstance(date_fields, frozenset)
+        else frozenset(date_fields)
+    )
+    convert_date = get_date_converter(memo)
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                key: convert_date(item)
+                if key in date_fields and item is not None
+                else convert(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [convert(item) for item in value]
+        return value
+
+    return convert(value)
+
+
+def deserialize_json_with_dates(
+    json_string: str,
+    date_fields: Iterable[str] = DATE_FIELDS,
+    memo: bool = True,
+) -> object:
+    """Decodes a JSON document, parsing the strings under date keys
+
+    Parameters
+    ----------
+    * json_string (str): The JSON document
+    * date_fields (Iterable[str]): Keys holding dates, defaults to the date fields of the API
+    * memo (bool): Remember the last parsed strings, faster when dates repeat
+
+    Returns
+    -------
+    * object: The decoded document
+    """
+    date_fields = frozenset(date_fields)
+    convert_date = get_date_converter(memo)
+
+    def object_hook(value: dict[str, Any]) -> dict[str, Any]:
+        for key in date_fields.intersection(value):
+            if value[key] is not None:
+                value[key] = convert_date(value[key])
         return value
 
-    return json.loads(json_string, object_hook=custom_reviver)
+    return json.loads(json_string, object_hook=object_hook)
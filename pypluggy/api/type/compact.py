@@ -0,0 +1,113 @@
+import dataclasses
+import types
+from typing import Any, Union, get_args, get_origin, get_type_hints
+
+from .account import Account
+from .investment import InvestmentTransaction
+from .loans import LoanInstallments
+from .transaction import Transaction
+
+# Compact variants already built, by original type and frozen flag
+compact_types: dict[tuple[type, bool], type] = {}
+
+
+def get_compact_annotation(annotation: Any, frozen: bool) -> Any:
+    """Replaces the dataclasses referred by an annotation with their compact
+    variants, ie. `Optional[TransactionPaymentData]`"""
+    if dataclasses.is_dataclass(annotation) and isinstance(annotation, type):
+        return compact(annotation, frozen)
+
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return Union[
+            tuple(
+                get_compact_annotation(argument, frozen)
+                for argument in get_args(annotation)
+            )
+        ]
+    if origin is list and get_args(annotation):
+        return list[get_compact_annotation(get_args(annotation)[0], frozen)]
+
+    return annotation
+
+
+def compact(cls: type, frozen: bool = False) -> type:
+    """Builds a variant of a dataclass whose instances use `__slots__`
+    instead of a `__dict__`, taking a fraction of the memory
+
+    Nested dataclasses are replaced by their compact variants as well. The
+    variants have the same fields, so `pypluggy.api.decoding` can decode to
+    them, but they are not subclasses of the original types.
+
+    Parameters
+    ----------
+    * cls (type): A dataclass from `pypluggy.api.type`, ie. `Transaction`
+    * frozen (bool): Make the instances immutable, and hashable when their fields are
+
+    Returns
+    -------
+    * type: The compact dataclass, named `Compact{name}` or `FrozenCompact{name}`
+    """
+    key = (cls, frozen)
+    if key in compact_types:
+        return compact_types[key]
+
+    hints = get_type_hints(cls)
+    fields = []
+    for field in dataclasses.fields(cls):
+        options = {}
+        if field.default is not dataclasses.MISSING:
+            options['default'] = field.default
+        if field.default_factory is not dataclasses.MISSING:
+            options['default_factory'] = field.default_factory
+        fields.append(
+            (
+                field.name,
+                get_compact_annotation(hints[field.name], frozen),
+                dataclasses.field(**options),
+            )
+        )
+
+    name = f'{"FrozenCompact" if frozen else "Compact"}{cls.__name__}'
+    compact_type = dataclasses.make_dataclass(
+        name, fields, slots=True, frozen=frozen
+    )
+    # Registered in this module, so instances can be pickled
+    compact_type.__module__ = __name__
+    globals().setdefault(name, compact_type)
+
+    compact_types[key] = compact_type
+    return compact_type
+
+
+def to_compact(record: Any, frozen: bool = False) -> Any:
+    """Copies a dataclass instance into its compact variant
+
+    Parameters
+    ----------
+    * record (Any): An instance of a dataclass from `pypluggy.api.type`
+    * frozen (bool): Copy into the frozen variant
+
+    Returns
+    -------
+    * Any: The compact copy, with nested dataclasses converted as well
+    """
+    if isinstance(record, list):
+        return [to_compact(item, frozen) for item in record]
+    if not dataclasses.is_dataclass(record) or isinstance(record, type):
+        return record
+    if type(record) in compact_types.values():
+        return record
+
+    return compact(type(record), frozen)(
+        **{
+            field.name: to_compact(getattr(record, field.name), frozen)
+            for field in dataclasses.fields(record)
+        }
+    )
+
+
+CompactTransaction = compact(Transaction)
+CompactInvestmentTransaction = compact(InvestmentTransaction)
+CompactAccount = compact(Account)
+CompactLoanInstallments = compact(LoanInstallments)
@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any, Awaitable, Iterable, Optional
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Returns the first path segment of an endpoint, ie. `items/{id}` -> `items`
+
+    Parameters
+    ----------
+    * endpoint (str): An endpoint path, with or without leading slash and query
+
+    Returns
+    -------
+    * str: The resource family of the endpoint
+    """
+    path = endpoint.split('?', 1)[0].strip('/')
+    return path.split('/', 1)[0]
+
+
+def request_key(endpoint: str, params: Optional[dict[str, Any]] = None) -> str:
+    """Builds a stable key for a GET request, ignoring the params order
+
+    Parameters
+    ----------
+    * endpoint (str): The endpoint path
+    * params (Optional[dict[str, Any]]): The query parameters
+
+    Returns
+    -------
+    * str: The endpoint followed by its sorted, non null query parameters
+    """
+    if not params:
+        return endpoint
+
+    query = '&'.join(
+        f'{key}={params[key]}'
+        for key in sorted(params)
+        if params[key] is not None
+    )
+    return f'{endpoint}?{query}' if query else endpoint
+
+
+async def gather_or_cancel(aws: Iterable[Awaitable[Any]]) -> list[Any]:
+    """Runs awaitables concurrently like `asyncio.gather`, cancelling the
+    ones still pending as soon as one of them fails"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
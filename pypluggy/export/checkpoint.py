@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+from datetime import date
+from typing import TYPE_CHECKING, Any, Optional
+
+from pypluggy.api.pagination import DEFAULT_PAGE_CONCURRENCY, MAX_PAGE_SIZE
+from pypluggy.api.utils import gather_or_cancel
+
+from .stream import to_api_text
+
+if TYPE_CHECKING:
+    from pypluggy.api.client import PluggyClient
+
+
+class ExportCheckpoint:
+    """Progress of an export, kept in a JSON file rewritten atomically.
+
+    For each account it records the pages already written, the size of
+    the data file once they were written, and the filters of the export.
+
+    Parameters
+    ----------
+    * path (str): Path of the checkpoint file, loaded if it exists
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.accounts: dict[str, dict[str, Any]] = {}
+
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as checkpoint_file:
+                self.accounts = json.load(checkpoint_file)['accounts']
+
+    def get_account(self, account_id: str) -> dict[str, Any]:
+        return self.accounts.setdefault(
+            account_id,
+            {
+                'options': None,
+                'total_pages': None,
+                'pages': [],
+                'offset': 0,
+                'done': False,
+            },
+        )
+
+    def save(self) -> None:
+        temporary_path = f'{self.path}.tmp'
+
+        with open(temporary_path, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump({'accounts': self.accounts}, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+
+        os.replace(temporary_path, self.path)
+
+
+class TransactionExportJob:
+    """Exports the transactions of several accounts to JSONL files, one per
+    account, and resumes where it stopped if the process dies halfway.
+
+    Pages are appended to `{directory}/{account_id}.jsonl` as they arrive,
+    and the checkpoint is saved after each one. On restart, the data files
+    are truncated to their last checkpointed size, dropping any page that
+    was written but not recorded, and only the missing pages are fetched.
+    The date the export started is kept as its `to` filter, so pages don't
+    shift when new transactions arrive between runs.
+
+    Parameters
+    ----------
+    * client (PluggyClient): The client used to fetch transactions
+    * account_ids (list[str]): The accounts to export
+    * directory (str): Where data files and the checkpoint are written
+    * concurrency (int): Maximum number of pages requested at the same time
+    * fsync (bool): Flush every page to disk before recording it
+    """
+
+    def __init__(
+        self,
+        client: 'PluggyClient',
+        account_ids: list[str],
+        directory: str,
+        concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+        fsync: bool = True,
+    ):
+        self.client = client
+        self.account_ids = account_ids
+        self.directory = directory
+        self.concurrency = concurrency
+        self.fsync = fsync
+        self.checkpoint = ExportCheckpoint(
+            os.path.join(directory, 'checkpoint.json')
+        )
+
+    def get_data_path(self, account_id: str) -> str:
+        return os.path.join(self.directory, f'{account_id}.jsonl')
+
+    def is_done(self) -> bool:
+        return all(
+            self.checkpoint.get_account(account_id)['done']
+            for account_id in self.account_ids
+        )
+
+    async def run(self) -> None:
+        """Exports every account, skipping the work already checkpointed"""
+        os.makedirs(self.directory, exist_ok=True)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        await gather_or_cancel(
+            self.export_account(account_id, semaphore)
+            for account_id in self.account_ids
+        )
+
+    async def export_account(
+        self, account_id: str, semaphore: Optional[asyncio.Semaphore] = None
+    ) -> None:
+        state = self.checkpoint.get_account(account_id)
+        if state['done']:
+            return
+
+        if state['options'] is None:
+            state['options'] = {
+                'pageSize': MAX_PAGE_SIZE,
+                'to': date.today().isoformat(),
+            }
+
+        paginator = self.client.paginate(
+            self.client.fetch_transactions,
+            account_id,
+            options=state['options'],
+            concurrency=self.concurrency,
+            semaphore=semaphore,
+        )
+        lock = asyncio.Lock()
+
+        with open(self.get_data_path(account_id), 'a+b') as data_file:
+            # Drop whatever was written after the last checkpoint
+            data_file.truncate(state['offset'])
+
+            async def export_page(page: int) -> None:
+                response = await paginator.fetch(page)
+
+                async with lock:
+                    state['total_pages'] = response['totalPages']
+                    self.write_page(data_file, response['results'])
+                    state['offset'] = data_file.tell()
+                    state['pages'].append(page)
+                    self.checkpoint.save()
+
+            if state['total_pages'] is None:
+                await export_page(1)
+
+            done_pages = set(state['pages'])
+            await gather_or_cancel(
+                export_page(page)
+                for page in range(1, state['total_pages'] + 1)
+                if page not in done_pages
+            )
+
+        state['done'] = True
+        self.checkpoint.save()
+
+    def write_page(self, data_file, transactions: list[Any]) -> None:
+        data_file.write(
+            b''.join(
+                # Dates are parsed when the client has `parse_dates` set
+                json.dumps(transaction, default=to_api_text).encode() + b'\n'
+                for transaction in transactions
+            )
+        )
+        data_file.flush()
+        if self.fsync:
+            os.fsync(data_file.fileno())
@@ -0,0 +1,341 @@
+import dataclasses
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    Optional,
+    get_origin,
+    get_type_hints,
+)
+
+from pypluggy.api.decoding import get_union_arguments
+from pypluggy.api.snapshot import has_product
+from pypluggy.api.sync import TransactionSyncResult
+from pypluggy.api.type.account import Account
+from pypluggy.api.type.investment import Investment
+from pypluggy.api.type.item import Item
+from pypluggy.api.type.loans import Loan
+from pypluggy.api.type.transaction import Transaction
+
+from .stream import to_api_text
+
+if TYPE_CHECKING:
+    from pypluggy.api.client import PluggyClient
+
+# Table of each mirrored object, keyed by its `id`
+MIRROR_TABLES = {
+    'items': Item,
+    'accounts': Account,
+    'transactions': Transaction,
+    'investments': Investment,
+    'loans': Loan,
+}
+
+# Indexes of the reads the mirror serves, by table
+MIRROR_INDEXES = {
+    'accounts': [('itemId',)],
+    'transactions': [('accountId', 'date'), ('category',)],
+    'investments': [('itemId',)],
+    'loans': [('itemId',)],
+}
+
+
+@dataclass
+class MirrorTable:
+    # Name of the SQLite table
+    name: str
+    # Dataclass the columns are derived from
+    cls: type
+    # One column per field of the dataclass, in order
+    columns: list[str]
+    # Columns holding nested objects or lists, stored as JSON
+    json_columns: list[str]
+
+    def get_create_statement(self) -> str:
+        definitions = ', '.join(
+            f'"{column}" TEXT PRIMARY KEY' if column == 'id' else f'"{column}"'
+            for column in self.columns
+        )
+        return f'CREATE TABLE IF NOT EXISTS {self.name} ({definitions})'
+
+    def get_index_statement(self, columns: tuple[str, ...]) -> str:
+        names = ', '.join(f'"{column}"' for column in columns)
+        return (
+            f'CREATE INDEX IF NOT EXISTS {self.name}_{"_".join(columns)} '
+            f'ON {self.name} ({names})'
+        )
+
+    def get_upsert_statement(self) -> str:
+        names = ', '.join(f'"{column}"' for column in self.columns)
+        placeholders = ', '.join('?' for _ in self.columns)
+        updates = ', '.join(
+            f'"{column}" = excluded."{column}"'
+            for column in self.columns
+            if column != 'id'
+        )
+        return (
+            f'INSERT INTO {self.name} ({names}) VALUES ({placeholders}) '
+            f'ON CONFLICT (id) DO UPDATE SET {updates}'
+        )
+
+
+def is_json_annotation(annotation: Any) -> bool:
+    """Whether values of a field are objects or lists rather than scalars"""
+    arguments = get_union_arguments(annotation)
+    if arguments is not None:
+        return any(is_json_annotation(argument) for argument in arguments)
+    if dataclasses.is_dataclass(annotation) and isinstance(annotation, type):
+        return True
+    return get_origin(annotation) in (list, dict)
+
+
+@lru_cache(maxsize=None)
+def get_mirror_table(name: str) -> MirrorTable:
+    cls = MIRROR_TABLES[name]
+    hints = get_type_hints(cls)
+    fields = dataclasses.fields(cls)
+
+    return MirrorTable(
+        name=name,
+        cls=cls,
+        columns=[field.name for field in fields],
+        json_columns=[
+            field.name
+            for field in fields
+            if is_json_annotation(hints[field.name])
+        ],
+    )
+
+
+def to_sql_value(value: Any) -> Any:
+    """Value stored for a field: scalars as they are, objects and lists as
+    JSON, and dates as ISO strings laid out like the ones of the API"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=to_api_text)
+    return to_api_text(value)
+
+
+class SQLiteMirror:
+    """Local copy of Items, accounts, transactions, investments and loans in
+    a SQLite file, so reads are served without calling the API.
+
+    Each table has one column per field of its dataclass, nested objects and
+    lists being stored as JSON. Writes are batched with `executemany` inside
+    a single transaction, and rows already mirrored are updated in place.
+    The file is in WAL mode, so readers are never blocked by a sync.
+
+    Parameters
+    ----------
+    * path (str): Path of the SQLite database file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        # Durable across crashes of the process in WAL mode, not of the OS
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+
+        with self.transaction():
+            for name in MIRROR_TABLES:
+                table = get_mirror_table(name)
+                self.connection.execute(table.get_create_statement())
+                for columns in MIRROR_INDEXES.get(name, []):
+                    self.connection.execute(table.get_index_statement(columns))
+
+    def __enter__(self) -> 'SQLiteMirror':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Runs the statements of the block in a single transaction"""
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+
+    def upsert(self, name: str, objects: Iterable[dict[str, Any]]) -> int:
+        """Inserts objects of the API, or updates them if already mirrored
+
+        Parameters
+        ----------
+        * name (str): Table of the objects, ie. 'transactions'
+        * objects (Iterable[dict[str, Any]]): The objects, as returned by the client
+
+        Returns
+        -------
+        * int: Number of objects written
+        """
+        table = get_mirror_table(name)
+        columns = table.columns
+        rows = [
+            tuple([to_sql_value(data.get(column)) for column in columns])
+            for data in objects
+        ]
+
+        with self.transaction() as connection:
+            connection.executemany(table.get_upsert_statement(), rows)
+
+        return len(rows)
+
+    def delete(self, name: str, ids: Iterable[str]) -> None:
+        """Removes objects from the mirror, ie. transactions gone upstream"""
+        with self.transaction() as connection:
+            connection.executemany(
+                f'DELETE FROM {get_mirror_table(name).name} WHERE id = ?',
+                [(id,) for id in ids],
+            )
+
+    def select(
+        self, name: str, where: str = '', params: Iterable[Any] = ()
+    ) -> list[dict[str, Any]]:
+        """Reads objects back, shaped as the client returns them
+
+        Parameters
+        ----------
+        * name (str): Table of the objects, ie. 'transactions'
+        * where (str): SQL appended to the query, ie. 'WHERE "accountId" = ?'
+        * params (Iterable[Any]): Values of the placeholders of `where`
+
+        Returns
+        -------
+        * list[dict[str, Any]]: The objects
+        """
+        table = get_mirror_table(name)
+        json_columns = set(table.json_columns)
+        names = ', '.join(f'"{column}"' for column in table.columns)
+        cursor = self.connection.execute(
+            f'SELECT {names} FROM {table.name} {where}', tuple(params)
+        )
+
+        return [
+            {
+                column: json.loads(value)
+                if column in json_columns and value is not None
+                else value
+                for column, value in zip(table.columns, row)
+            }
+            for row in cursor
+        ]
+
+    def get_item(self, item_id: str) -> Optional[Item]:
+        items = self.select('items', 'WHERE id = ?', (item_id,))
+        return items[0] if items else None
+
+    def get_accounts(self, item_id: str) -> list[Account]:
+        return self.select('accounts', 'WHERE "itemId" = ?', (item_id,))
+
+    def get_transactions(
+        self,
+        account_id: str,
+        from_: Optional[str] = None,
+        to: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> list[Transaction]:
+        """Transactions of an account, latest first
+
+        Parameters
+        ----------
+        * account_id (str): The account id
+        * from_ (Optional[str]): Earliest date, as 'YYYY-MM-DD'
+        * to (Optional[str]): Latest date, as 'YYYY-MM-DD', included
+        * category (Optional[str]): Only transactions of this category
+
+        Returns
+        -------
+        * list[Transaction]: The transactions
+        """
+        conditions = ['"accountId" = ?']
+        params: list[Any] = [account_id]
+        if from_ is not None:
+            conditions.append('"date" >= ?')
+            params.append(from_)
+        if to is not None:
+            # Dates are ISO strings, anything on the `to` day sorts before
+            conditions.append('"date" < ?')
+            params.append(f'{to}~')
+        if category is not None:
+            conditions.append('"category" = ?')
+            params.append(category)
+
+        return self.select(
+            'transactions',
+            f'WHERE {" AND ".join(conditions)} ORDER BY "date" DESC',
+            params,
+        )
+
+    def get_investments(self, item_id: str) -> list[Investment]:
+        return self.select('investments', 'WHERE "itemId" = ?', (item_id,))
+
+    def get_loans(self, item_id: str) -> list[Loan]:
+        return self.select('loans', 'WHERE "itemId" = ?', (item_id,))
+
+    def apply_transaction_sync(self, result: TransactionSyncResult) -> None:
+        """Applies the changes found by `PluggyClient.sync_transactions`"""
+        self.upsert('transactions', result.upserts)
+        self.delete('transactions', result.tombstones)
+
+    async def sync_item(
+        self, client: 'PluggyClient', item_id: str
+    ) -> dict[str, int]:
+        """Mirrors an Item and its accounts, transactions, investments and
+        loans. Transactions are written a page at a time as they arrive.
+
+        Parameters
+        ----------
+        * client (PluggyClient): The client used to fetch the data
+        * item_id (str): The Item id
+
+        Returns
+        -------
+        * dict[str, int]: Number of objects written to each table
+        """
+        item = await client.fetch_item(item_id)
+        counts = dict.fromkeys(MIRROR_TABLES, 0)
+        counts['items'] = self.upsert('items', [item])
+
+        if has_product(item, 'ACCOUNTS') or has_product(item, 'CREDIT_CARDS'):
+            accounts = (await client.fetch_accounts(item_id))['results']
+            counts['accounts'] = self.upsert('accounts', accounts)
+
+            if has_product(item, 'TRANSACTIONS'):
+                for account in accounts:
+                    async for page in client.iter_transaction_pages(
+                        account['id']
+                    ):
+                        counts['transactions'] += self.upsert(
+                            'transactions', page['results']
+                        )
+
+        if has_product(item, 'INVESTMENTS'):
+            investments = await client.paginate(
+                client.fetch_investments, item_id, None
+            ).collect()
+            counts['investments'] = self.upsert('investments', investments)
+
+        if has_product(item, 'LOANS'):
+            loans = await client.paginate(
+                client.fetch_loans, item_id
+            ).collect()
+            counts['loans'] = self.upsert('loans', loans)
+
+        return counts
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,375 @@
+import dataclasses
+import datetime
+import enum
+import os
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Literal,
+    Optional,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from pypluggy.api.decoding import get_union_arguments
+from pypluggy.api.pagination import MAX_PAGE_SIZE
+from pypluggy.api.transforms import parse_date_cached, parse_datetime_cached
+from pypluggy.api.type.account import Account
+from pypluggy.api.type.investment import Investment
+from pypluggy.api.type.transaction import Transaction
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = pq = None
+
+if TYPE_CHECKING:
+    from pypluggy.api.client import PluggyClient
+
+# Rows buffered per partition before a row group is written
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+ValueConverter = Callable[[Any], Any]
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            'Parquet export requires pyarrow, install it with `pip install pyarrow`'
+        )
+
+
+def get_arrow_type(annotation: Any) -> 'pa.DataType':
+    """Arrow type of a dataclass field annotation
+
+    Enums and literals become dictionary-encoded strings, nested dataclasses
+    structs, numbers doubles, and values of any other type their string
+    representation.
+    """
+    if annotation is str:
+        return pa.string()
+    if annotation is bool:
+        return pa.bool_()
+    # JSON numbers are doubles, and fields annotated `int` such as
+    # `CreditCardMetadata.totalAmount` do carry fractions
+    if annotation is int or annotation is float:
+        return pa.float64()
+    if annotation is datetime.datetime:
+        return pa.timestamp('ms', tz='UTC')
+    if annotation is datetime.date:
+        return pa.date32()
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return pa.dictionary(pa.int32(), pa.string())
+    if dataclasses.is_dataclass(annotation) and isinstance(annotation, type):
+        return pa.struct(list(get_arrow_schema(annotation)))
+
+    arguments = get_union_arguments(annotation)
+    if arguments is not None and len(arguments) == 1:
+        return get_arrow_type(arguments[0])
+
+    origin = get_origin(annotation)
+    arguments = get_args(annotation)
+    if origin is Literal:
+        return pa.dictionary(pa.int32(), pa.string())
+    if origin is list and arguments:
+        return pa.list_(get_arrow_type(arguments[0]))
+    if origin is dict and arguments:
+        return pa.map_(
+            get_arrow_type(arguments[0]), get_arrow_type(arguments[1])
+        )
+
+    return pa.string()
+
+
+@lru_cache(maxsize=None)
+def get_arrow_schema(cls: type) -> 'pa.Schema':
+    """Arrow schema with one nullable field per field of a dataclass
+
+    Parameters
+    ----------
+    * cls (type): A dataclass from `pypluggy.api.type`, ie. `Transaction`
+
+    Returns
+    -------
+    * pa.Schema: The fixed schema of the exported files
+    """
+    require_pyarrow()
+    hints = get_type_hints(cls)
+
+    return pa.schema(
+        [
+            pa.field(field.name, get_arrow_type(hints[field.name]))
+            for field in dataclasses.fields(cls)
+        ]
+    )
+
+
+def get_value_converter(arrow_type: 'pa.DataType') -> Optional[ValueConverter]:
+    """Converts JSON values to what Arrow expects for a type, None if they
+    can be used as they are"""
+    if pa.types.is_timestamp(arrow_type):
+        return parse_datetime_cached
+    if pa.types.is_date(arrow_type):
+        return parse_date_cached
+    if pa.types.is_string(arrow_type) or pa.types.is_dictionary(arrow_type):
+        return lambda value: value if isinstance(value, str) else str(value)
+    if pa.types.is_struct(arrow_type):
+        return get_row_converter(pa.schema(list(arrow_type)))
+    if pa.types.is_list(arrow_type):
+        convert = get_value_converter(arrow_type.value_type)
+        if convert is None:
+            return None
+        return lambda values: [
+            None if value is None else convert(value) for value in values
+        ]
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_row_converter(schema: 'pa.Schema') -> ValueConverter:
+    converters = [
+        (field.name, convert)
+        for field in schema
+        if (convert := get_value_converter(field.type)) is not None
+    ]
+
+    def convert_row(row: dict[str, Any]) -> dict[str, Any]:
+        row = dict(row)
+        for name, convert in converters:
+            value = row.get(name)
+            if value is not None:
+                row[name] = convert(value)
+        return row
+
+    return convert_row
+
+
+def to_record_batch(cls: type, rows: list[dict[str, Any]]) -> 'pa.RecordBatch':
+    """Converts objects of the API to a record batch with the schema of a
+    dataclass, ignoring keys the schema doesn't have
+
+    Parameters
+    ----------
+    * cls (type): A dataclass from `pypluggy.api.type`, ie. `Transaction`
+    * rows (list[dict[str, Any]]): The objects, as returned by the client
+
+    Returns
+    -------
+    * pa.RecordBatch: The rows
+    """
+    schema = get_arrow_schema(cls)
+    convert_row = get_row_converter(schema)
+    return pa.RecordBatch.from_pylist(
+        [convert_row(row) for row in rows], schema=schema
+    )
+
+
+class PartitionedParquetWriter:
+    """Writes record batches to Parquet files partitioned Hive-style, ie.
+    `{directory}/item_id=.../account_id=.../month=2024-01/part-0.parquet`
+
+    Batches are buffered per partition and written as row groups of up to
+    `row_group_size` rows. A partition's file is complete once
+    `close_partition` or `close` is called. Rows written to a partition
+    after it was closed go to a new file, ie. `part-1.parquet`.
+
+    Parameters
+    ----------
+    * directory (str): Root directory of the dataset
+    * schema (pa.Schema): Schema of every file
+    * row_group_size (int): Rows buffered per partition before being written
+    * compression (str): Parquet compression codec
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        schema: 'pa.Schema',
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = 'zstd',
+    ):
+        require_pyarrow()
+        self.directory = directory
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.writers: dict[tuple, 'pq.ParquetWriter'] = {}
+        self.buffers: dict[tuple, list['pa.RecordBatch']] = {}
+        # Number of files already closed, by partition
+        self.parts: dict[tuple, int] = {}
+
+    def __enter__(self) -> 'PartitionedParquetWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get_path(self, partition: tuple[tuple[str, str], ...]) -> str:
+        return os.path.join(
+            self.directory,
+            *(f'{key}={value}' for key, value in partition),
+            f'part-{self.parts.get(partition, 0)}.parquet',
+        )
+
+    def write(
+        self,
+        partition: tuple[tuple[str, str], ...],
+        batch: 'pa.RecordBatch',
+    ) -> None:
+        """Adds rows to a partition, given as ((key, value), ...) pairs"""
+        if not batch.num_rows:
+            return
+
+        buffer = self.buffers.setdefault(partition, [])
+        buffer.append(batch)
+        if sum(batch.num_rows for batch in buffer) >= self.row_group_size:
+            self.flush(partition)
+
+    def flush(self, partition: tuple[tuple[str, str], ...]) -> None:
+        buffer = self.buffers.pop(partition, None)
+        if not buffer:
+            return
+
+        writer = self.writers.get(partition)
+        if writer is None:
+            path = self.get_path(partition)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            writer = self.writers[partition] = pq.ParquetWriter(
+                path, self.schema, compression=self.compression
+            )
+
+        writer.write_table(pa.Table.from_batches(buffer, self.schema))
+
+    def close_partition(self, partition: tuple[tuple[str, str], ...]) -> None:
+        """Writes the rows buffered for a partition and completes its file"""
+        self.flush(partition)
+
+        writer = self.writers.pop(partition, None)
+        if writer is not None:
+            writer.close()
+            self.parts[partition] = self.parts.get(partition, 0) + 1
+
+    def close(self) -> None:
+        for partition in {*self.buffers, *self.writers}:
+            self.close_partition(partition)
+
+
+def get_transaction_month(transaction: Transaction) -> str:
+    return str(transaction['date'])[:7]
+
+
+def get_transaction_partition(
+    item_id: str, account_id: str, month: str
+) -> tuple[tuple[str, str], ...]:
+    return (('item_id', item_id), ('account_id', account_id), ('month', month))
+
+
+class ParquetExporter:
+    """Exports the accounts, transactions and investments of Items to
+    Parquet datasets, with a fixed schema derived from the dataclasses of
+    `pypluggy.api.type`:
+
+    * `{directory}/accounts/item_id=.../part-0.parquet`
+    * `{directory}/transactions/item_id=.../account_id=.../month=YYYY-MM/part-0.parquet`
+    * `{directory}/investments/item_id=.../part-0.parquet`
+
+    Transaction pages are streamed from the client, converted to record
+    batches and appended to their month's partition. Pages arrive in date
+    order, so a month's file is completed as soon as a page no longer has
+    transactions of that month. At most a page and the months it spans,
+    each up to `row_group_size` rows, are held in memory.
+
+    Parameters
+    ----------
+    * client (PluggyClient): The client used to fetch the data
+    * directory (str): Root directory of the datasets
+    * row_group_size (int): Rows buffered per partition before being written
+    * compression (str): Parquet compression codec
+    """
+
+    def __init__(
+        self,
+        client: 'PluggyClient',
+        directory: str,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = 'zstd',
+    ):
+        require_pyarrow()
+        self.client = client
+        self.directory = directory
+        self.row_group_size = row_group_size
+        self.compression = compression
+
+    def get_writer(self, name: str, cls: type) -> PartitionedParquetWriter:
+        return PartitionedParquetWriter(
+            os.path.join(self.directory, name),
+            get_arrow_schema(cls),
+            self.row_group_size,
+            self.compression,
+        )
+
+    async def export_items(self, item_ids: list[str]) -> None:
+        """Exports every Item, one after the other"""
+        for item_id in item_ids:
+            await self.export_item(item_id)
+
+    async def export_item(self, item_id: str) -> None:
+        """Exports the accounts, transactions and investments of an Item"""
+        accounts = (await self.client.fetch_accounts(item_id))['results']
+
+        with self.get_writer('accounts', Account) as writer:
+            writer.write(
+                (('item_id', item_id),), to_record_batch(Account, accounts)
+            )
+
+        with self.get_writer('transactions', Transaction) as writer:
+            for account in accounts:
+                await self.export_transactions(writer, item_id, account['id'])
+
+        investments = await self.client.paginate(
+            self.client.fetch_investments, item_id, None
+        ).collect()
+        with self.get_writer('investments', Investment) as writer:
+            writer.write(
+                (('item_id', item_id),),
+                to_record_batch(Investment, investments),
+            )
+
+    async def export_transactions(
+        self,
+        writer: PartitionedParquetWriter,
+        item_id: str,
+        account_id: str,
+    ) -> None:
+        open_months: set[str] = set()
+        async for page in self.client.iter_transaction_pages(
+            account_id, {'pageSize': MAX_PAGE_SIZE}
+        ):
+            months: dict[str, list[Transaction]] = {}
+            for transaction in page['results']:
+                months.setdefault(
+                    get_transaction_month(transaction), []
+                ).append(transaction)
+
+            # Months of the previous page missing from this one are done
+            for month in open_months.difference(months):
+                writer.close_partition(
+                    get_transaction_partition(item_id, account_id, month)
+                )
+            open_months = set(months)
+
+            for month, transactions in months.items():
+                writer.write(
+                    get_transaction_partition(item_id, account_id, month),
+                    to_record_batch(Transaction, transactions),
+                )
+
+        for month in open_months:
+            writer.close_partition(
+                get_transaction_partition(item_id, account_id, month)
+            )
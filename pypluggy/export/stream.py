@@ -0,0 +1,256 @@
+import csv
+import dataclasses
+import datetime
+import enum
+import gzip
+import io
+import json
+from functools import lru_cache
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Optional,
+    Union,
+    get_type_hints,
+)
+
+from pypluggy.api.decoding import get_union_arguments
+from pypluggy.api.pagination import DEFAULT_PREFETCH
+from pypluggy.api.transforms import UTC
+from pypluggy.api.type.transaction import Transaction, TransactionFilters
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+if TYPE_CHECKING:
+    from pypluggy.api.client import PluggyClient
+
+STREAM_FORMATS = ['jsonl', 'csv']
+
+COMPRESSIONS = ['gzip', 'zstd']
+
+# Extensions telling the compression of a file, when not given explicitly
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+
+
+def get_compression(path: str, compression: Optional[str] = None) -> str:
+    """Compression of a file, 'none', 'gzip' or 'zstd', inferred from its
+    extension unless given"""
+    if compression is None:
+        return next(
+            (
+                name
+                for extension, name in COMPRESSION_EXTENSIONS.items()
+                if path.endswith(extension)
+            ),
+            'none',
+        )
+    if compression != 'none' and compression not in COMPRESSIONS:
+        raise ValueError(
+            f'Unknown compression {compression!r}, use none, {", ".join(COMPRESSIONS)}'
+        )
+    return compression
+
+
+def get_format(path: str, format: Optional[str] = None) -> str:
+    """Format of a file, 'jsonl' or 'csv', inferred from its extension
+    unless given"""
+    if format is None:
+        for extension in COMPRESSION_EXTENSIONS:
+            if path.endswith(extension):
+                path = path[: -len(extension)]
+        format = 'csv' if path.endswith('.csv') else 'jsonl'
+    if format not in STREAM_FORMATS:
+        raise ValueError(
+            f'Unknown format {format!r}, use one of {", ".join(STREAM_FORMATS)}'
+        )
+    return format
+
+
+def open_compressed(path: str, compression: str = 'none') -> IO[bytes]:
+    """Opens a file for writing bytes, compressed on the fly"""
+    if compression == 'gzip':
+        return gzip.open(path, 'wb')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError(
+                'zstd compression requires zstandard, install it with `pip install zstandard`'
+            )
+        return zstandard.open(path, 'wb')
+    return open(path, 'wb')
+
+
+def to_api_text(value: Any) -> Any:
+    """Value JSON and CSV can hold for dates and enums, left by the client
+    when `parse_dates` is set or by `pypluggy.api.decoding`
+
+    Datetimes are laid out like the ones of the API, ie.
+    '2024-01-31T10:00:00.000Z', so the files written are the same whether
+    the client parsed dates or not.
+    """
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        value = value.astimezone(UTC)
+        return f'{value:%Y-%m-%dT%H:%M:%S}.{value.microsecond // 1000:03d}Z'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def get_dataclass(annotation: Any) -> Optional[type]:
+    """The dataclass of an annotation, unwrapping Optional"""
+    arguments = get_union_arguments(annotation)
+    if arguments is not None and len(arguments) == 1:
+        annotation = arguments[0]
+    if dataclasses.is_dataclass(annotation) and isinstance(annotation, type):
+        return annotation
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_csv_columns(cls: type) -> tuple[tuple[str, ...], ...]:
+    """Key path of each CSV column of a dataclass, nested dataclasses such
+    as `paymentData` and `merchant` being flattened into one column per
+    field, ie. ('paymentData', 'payer', 'name')"""
+    hints = get_type_hints(cls)
+    columns = []
+
+    for field in dataclasses.fields(cls):
+        nested = get_dataclass(hints[field.name])
+        if nested is None:
+            columns.append((field.name,))
+        else:
+            columns.extend(
+                (field.name, *path) for path in get_csv_columns(nested)
+            )
+
+    return tuple(columns)
+
+
+def flatten(
+    record: dict[str, Any], columns: tuple[tuple[str, ...], ...]
+) -> list[Any]:
+    """Values of a record for each column, None when missing"""
+    row = []
+    for path in columns:
+        value = record
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value is not None and not isinstance(value, (str, int, float)):
+            value = to_api_text(value)
+        row.append(value)
+    return row
+
+
+class TransactionStreamWriter:
+    """Writes transactions to a JSONL or CSV file one page at a time, so
+    memory doesn't grow with the number of transactions written.
+
+    CSV files have a fixed header derived from `Transaction`, with the
+    fields of `paymentData`, `merchant` and `creditCardMetadata` flattened
+    into dotted columns, ie. `merchant.name`.
+
+    Parameters
+    ----------
+    * path (str): Path of the file, overwritten if it exists
+    * format (Optional[str]): 'jsonl' or 'csv', inferred from the extension by default
+    * compression (Optional[str]): 'none', 'gzip' or 'zstd', inferred from the extension
+    ('.gz', '.zst') by default
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: Optional[str] = None,
+        compression: Optional[str] = None,
+    ):
+        self.path = path
+        self.format = get_format(path, format)
+        self.compression = get_compression(path, compression)
+        self.count = 0
+        self.file = open_compressed(path, self.compression)
+
+        if self.format == 'csv':
+            self.columns = get_csv_columns(Transaction)
+            self.text_file = io.TextIOWrapper(
+                self.file, encoding='utf-8', newline=''
+            )
+            self.csv_writer = csv.writer(self.text_file)
+            self.csv_writer.writerow(['.'.join(path) for path in self.columns])
+
+    def __enter__(self) -> 'TransactionStreamWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write_page(self, transactions: list[Transaction]) -> None:
+        """Appends transactions, one record per line"""
+        if self.format == 'csv':
+            self.csv_writer.writerows(
+                flatten(transaction, self.columns)
+                for transaction in transactions
+            )
+        else:
+            self.file.write(
+                b''.join(
+                    json.dumps(
+                        transaction, ensure_ascii=False, default=to_api_text
+                    ).encode()
+                    + b'\n'
+                    for transaction in transactions
+                )
+            )
+        self.count += len(transactions)
+
+    def close(self) -> None:
+        if self.format == 'csv':
+            # Closes the compressed file as well
+            self.text_file.close()
+        else:
+            self.file.close()
+
+
+async def stream_transactions(
+    client: 'PluggyClient',
+    account_ids: Union[str, list[str]],
+    path: str,
+    format: Optional[str] = None,
+    compression: Optional[str] = None,
+    options: TransactionFilters = {},
+    prefetch: int = DEFAULT_PREFETCH,
+) -> int:
+    """Writes the transactions of accounts to a file as their pages arrive
+
+    At most `prefetch + 1` pages are held in memory at any time, however
+    many transactions the accounts have.
+
+    Parameters
+    ----------
+    * client (PluggyClient): The client used to fetch transactions
+    * account_ids (Union[str, list[str]]): The account, or accounts, to export
+    * path (str): Path of the file, ie. 'transactions.csv.gz'
+    * format (Optional[str]): 'jsonl' or 'csv', inferred from the extension by default
+    * compression (Optional[str]): 'none', 'gzip' or 'zstd', inferred from the extension by default
+    * options (TransactionFilters): Transaction options to filter
+    * prefetch (int): Number of pages downloaded ahead of the writer
+
+    Returns
+    -------
+    * int: Number of transactions written
+    """
+    if isinstance(account_ids, str):
+        account_ids = [account_ids]
+
+    with TransactionStreamWriter(path, format, compression) as writer:
+        for account_id in account_ids:
+            async for page in client.iter_transaction_pages(
+                account_id, options, prefetch
+            ):
+                writer.write_page(page['results'])
+
+    return writer.count
@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from pypluggy.analytics.aggregate import aggregate_spend  # noqa: E402
+from pypluggy.analytics.frame import TransactionFrame  # noqa: E402
+
+
+def make_transaction(id: str, account_id: str, currency_code: str, **fields):
+    return {
+        'id': id,
+        'accountId': account_id,
+        'date': '2024-01-15T10:00:00.000Z',
+        'description': 'Groceries',
+        'type': 'DEBIT',
+        'amount': -10.0,
+        'currencyCode': currency_code,
+        'category': 'Food',
+        **fields,
+    }
+
+
+# A BRL account and a USD account, the BRL one paying once in USD
+TRANSACTIONS = [
+    make_transaction('brl', 'brl-account', 'BRL', amount=-100.0),
+    make_transaction(
+        'brl-abroad',
+        'brl-account',
+        'USD',
+        amount=-5.0,
+        amountInAccountCurrency=-25.0,
+    ),
+    make_transaction('usd', 'usd-account', 'USD', amount=-10.0),
+    make_transaction(
+        'usd-refund', 'usd-account', 'USD', type='CREDIT', amount=4.0
+    ),
+]
+
+
+def test_account_currency_keeps_accounts_apart():
+    totals = aggregate_spend(
+        TransactionFrame.from_transactions(TRANSACTIONS), by='category'
+    )
+    records = {record['account_id']: record for record in totals.to_records()}
+
+    assert records['brl-account']['category'] == 'Food'
+    assert records['brl-account']['debits'] == 125.0
+    assert records['brl-account']['count'] == 2
+    assert records['usd-account']['debits'] == 10.0
+    assert records['usd-account']['credits'] == 4.0
+    assert records['usd-account']['net'] == -6.0
+
+
+def test_transaction_currency_keeps_currencies_apart():
+    totals = aggregate_spend(
+        TransactionFrame.from_transactions(TRANSACTIONS),
+        by='category',
+        currency='transaction',
+    )
+    records = {
+        record['currency_code']: record for record in totals.to_records()
+    }
+
+    assert set(records) == {'BRL', 'USD'}
+    assert records['BRL']['debits'] == 100.0
+    assert records['USD']['debits'] == 15.0
+    assert records['USD']['credits'] == 4.0
+
+
+def test_unknown_key_is_rejected():
+    frame = TransactionFrame.from_transactions(TRANSACTIONS)
+    with pytest.raises(ValueError):
+        aggregate_spend(frame, by='merchant')
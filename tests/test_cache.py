@@ -0,0 +1,26 @@
+from pypluggy.api.cache import DEFAULT_TTLS, TTLCache
+
+
+def test_caches_do_not_share_ttls():
+    defaults = dict(DEFAULT_TTLS)
+    first = TTLCache()
+    second = TTLCache()
+
+    first.ttls['accounts'] = 60
+    first.ttls['connectors'] = 5
+
+    assert first.get_ttl('accounts') == 60
+    assert second.get_ttl('accounts') is None
+    assert second.get_ttl('connectors') == defaults['connectors']
+    assert DEFAULT_TTLS == defaults
+
+
+def test_given_ttls_are_copied():
+    ttls = {'accounts': 60}
+    cache = TTLCache(ttls)
+
+    cache.ttls['accounts'] = 5
+
+    assert ttls == {'accounts': 60}
+    # Only the given endpoint families are cached
+    assert cache.get_ttl('categories') is None
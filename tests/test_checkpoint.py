@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+from datetime import date
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from pypluggy.api.client import PluggyClient
+from pypluggy.export.checkpoint import TransactionExportJob
+
+TRANSACTIONS = [
+    {
+        'id': f'tx{index}',
+        'accountId': 'account',
+        'date': f'2024-{1 + index % 12:02d}-{1 + index % 28:02d}T10:00:00.000Z',
+        'description': f'Transaction {index}',
+        'amount': -float(index),
+    }
+    for index in range(1234)
+]
+
+
+class TransactionsServer:
+    """Stand-in for the API, serving TRANSACTIONS in pages and failing the
+    pages listed in `failing_pages` once"""
+
+    def __init__(self, failing_pages: tuple[int, ...] = ()):
+        self.failing_pages = set(failing_pages)
+        self.queries: list[dict[str, str]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/auth':
+            return httpx.Response(200, json={'apiKey': 'key'})
+
+        query = {
+            key: values[0]
+            for key, values in parse_qs(request.url.query.decode()).items()
+        }
+        self.queries.append(query)
+        page = int(query['page'])
+        size = int(query['pageSize'])
+
+        if page in self.failing_pages:
+            self.failing_pages.remove(page)
+            raise RuntimeError(f'Export interrupted on page {page}')
+
+        return httpx.Response(
+            200,
+            json={
+                'results': TRANSACTIONS[(page - 1) * size : page * size],
+                'page': page,
+                'total': len(TRANSACTIONS),
+                'totalPages': -(-len(TRANSACTIONS) // size),
+            },
+        )
+
+
+async def run_export(
+    server: TransactionsServer, directory: str, **client_options
+) -> TransactionExportJob:
+    client = PluggyClient(
+        'client_id',
+        'client_secret',
+        session=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+        base_url='http://pluggy.test',
+        **client_options,
+    )
+    job = TransactionExportJob(client, ['account'], directory, fsync=False)
+    try:
+        await job.run()
+    finally:
+        await client.session.aclose()
+    return job
+
+
+def read_ids(path: str) -> list[str]:
+    with open(path, encoding='utf-8') as data_file:
+        return [json.loads(line)['id'] for line in data_file]
+
+
+def test_resumed_export_has_no_duplicate_or_missing_ids(tmp_path):
+    directory = str(tmp_path)
+    server = TransactionsServer(failing_pages=(3,))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run_export(server, directory))
+
+    with open(os.path.join(directory, 'checkpoint.json')) as checkpoint_file:
+        state = json.load(checkpoint_file)['accounts']['account']
+    assert not state['done']
+    assert 1 in state['pages'] and 3 not in state['pages']
+    written_pages = set(state['pages'])
+
+    # A page torn by the crash, written after the last checkpoint
+    data_path = os.path.join(directory, 'account.jsonl')
+    with open(data_path, 'ab') as data_file:
+        data_file.write(b'{"id": "tx-torn", "amou')
+
+    first_run_queries = len(server.queries)
+    job = asyncio.run(run_export(server, directory))
+
+    assert job.is_done()
+    ids = read_ids(data_path)
+    assert len(ids) == len(set(ids))
+    assert sorted(ids) == sorted(
+        transaction['id'] for transaction in TRANSACTIONS
+    )
+
+    # Pages already written were not fetched again
+    resumed_pages = {
+        int(query['page']) for query in server.queries[first_run_queries:]
+    }
+    assert resumed_pages.isdisjoint(written_pages)
+
+    # Every request of both runs used the `to` date pinned on the first
+    assert {query['to'] for query in server.queries} == {
+        date.today().isoformat()
+    }
+
+
+def test_export_with_parsed_dates(tmp_path):
+    directory = str(tmp_path)
+    asyncio.run(run_export(TransactionsServer(), directory, parse_dates=True))
+
+    with open(os.path.join(directory, 'account.jsonl')) as data_file:
+        first = json.loads(data_file.readline())
+    # Written like the API sends it, as when dates are not parsed
+    assert first['date'] == '2024-01-01T10:00:00.000Z'
@@ -0,0 +1,129 @@
+import asyncio
+
+import httpx
+
+from pypluggy.api.client import PluggyClient
+from pypluggy.api.retry import RetryPolicy
+
+CATEGORIES = {'results': [{'id': '01000000', 'description': 'Income'}]}
+
+
+class SlowServer:
+    """Holds every GET until `release` is set, counting the requests"""
+
+    def __init__(self, status_code: int = 200):
+        self.status_code = status_code
+        self.release = asyncio.Event()
+        self.requests: list[httpx.Request] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/auth':
+            return httpx.Response(200, json={'apiKey': 'key'})
+
+        self.requests.append(request)
+        await self.release.wait()
+        return httpx.Response(self.status_code, json=CATEGORIES)
+
+
+def create_client(server: SlowServer, **kwargs) -> PluggyClient:
+    return PluggyClient(
+        'client_id',
+        'client_secret',
+        session=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+        base_url='http://pluggy.test',
+        retry_policy=RetryPolicy(max_attempts=1),
+        **kwargs,
+    )
+
+
+async def wait_for_requests(server: SlowServer, count: int) -> None:
+    while len(server.requests) < count:
+        await asyncio.sleep(0)
+
+
+def test_concurrent_gets_share_one_request():
+    async def fetch():
+        server = SlowServer()
+        client = create_client(server)
+        tasks = [
+            asyncio.ensure_future(client.fetch_categories()) for _ in range(10)
+        ]
+        await wait_for_requests(server, 1)
+        server.release.set()
+
+        results = await asyncio.gather(*tasks)
+        await client.session.aclose()
+        return server, client, results
+
+    server, client, results = asyncio.run(fetch())
+
+    assert len(server.requests) == 1
+    assert results == [CATEGORIES] * 10
+    assert client.in_flight_requests == {}
+
+
+def test_gets_are_not_shared_when_disabled():
+    async def fetch():
+        server = SlowServer()
+        client = create_client(server, coalesce_requests=False)
+        tasks = [
+            asyncio.ensure_future(client.fetch_categories()) for _ in range(3)
+        ]
+        await wait_for_requests(server, 3)
+        server.release.set()
+
+        await asyncio.gather(*tasks)
+        await client.session.aclose()
+        return server
+
+    assert len(asyncio.run(fetch()).requests) == 3
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_request():
+    async def fetch():
+        server = SlowServer()
+        client = create_client(server)
+        cancelled = asyncio.ensure_future(client.fetch_categories())
+        waiters = [
+            asyncio.ensure_future(client.fetch_categories()) for _ in range(2)
+        ]
+        await wait_for_requests(server, 1)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        server.release.set()
+
+        results = await asyncio.gather(*waiters)
+        await client.session.aclose()
+        return server, cancelled, results
+
+    server, cancelled, results = asyncio.run(fetch())
+
+    assert cancelled.cancelled()
+    assert results == [CATEGORIES] * 2
+    assert len(server.requests) == 1
+
+
+def test_failures_reach_every_waiter_and_are_not_kept():
+    async def fetch():
+        server = SlowServer(status_code=503)
+        client = create_client(server)
+        tasks = [
+            asyncio.ensure_future(client.fetch_categories()) for _ in range(3)
+        ]
+        await wait_for_requests(server, 1)
+        server.release.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # The next call sends a new request instead of reusing the failure
+        server.status_code = 200
+        retried = await client.fetch_categories()
+        await client.session.aclose()
+        return server, results, retried
+
+    server, results, retried = asyncio.run(fetch())
+
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+    assert retried == CATEGORIES
+    assert len(server.requests) == 2
@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import httpx
+
+from pypluggy.api.cache import ValidatorCache
+from pypluggy.api.client import PluggyClient
+
+CATEGORIES = {'results': [{'id': '01000000', 'description': 'Income'}]}
+ETAG = '"categories-v1"'
+LAST_MODIFIED = 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+
+class CategoriesServer:
+    """Stand-in for the API, answering conditional GETs of /categories"""
+
+    def __init__(self):
+        self.body = CATEGORIES
+        self.etag = ETAG
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/auth':
+            return httpx.Response(200, json={'apiKey': 'key'})
+
+        self.requests.append(request)
+        if request.headers.get('If-None-Match') == self.etag:
+            return httpx.Response(304)
+
+        return httpx.Response(
+            200,
+            content=json.dumps(self.body).encode(),
+            headers={'ETag': self.etag, 'Last-Modified': LAST_MODIFIED},
+        )
+
+
+def create_client(
+    server: CategoriesServer, validator_cache: ValidatorCache
+) -> PluggyClient:
+    return PluggyClient(
+        'client_id',
+        'client_secret',
+        session=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+        base_url='http://pluggy.test',
+        validator_cache=validator_cache,
+    )
+
+
+async def fetch_categories_twice(
+    server: CategoriesServer, validator_cache: ValidatorCache
+) -> tuple:
+    client = create_client(server, validator_cache)
+    first = await client.fetch_categories()
+    second = await client.fetch_categories()
+    await client.session.aclose()
+
+    return first, second
+
+
+def test_first_request_is_unconditional():
+    server = CategoriesServer()
+    asyncio.run(fetch_categories_twice(server, ValidatorCache()))
+
+    assert 'If-None-Match' not in server.requests[0].headers
+    assert 'If-Modified-Since' not in server.requests[0].headers
+
+
+def test_stored_validators_are_sent():
+    server = CategoriesServer()
+    asyncio.run(fetch_categories_twice(server, ValidatorCache()))
+
+    headers = server.requests[1].headers
+    assert headers['If-None-Match'] == ETAG
+    assert headers['If-Modified-Since'] == LAST_MODIFIED
+
+
+def test_not_modified_serves_the_stored_body():
+    server = CategoriesServer()
+    validator_cache = ValidatorCache()
+    first, second = asyncio.run(
+        fetch_categories_twice(server, validator_cache)
+    )
+
+    assert first == CATEGORIES
+    assert second == CATEGORIES
+    assert validator_cache.not_modified == 1
+
+
+def test_changed_resource_replaces_the_stored_body():
+    server = CategoriesServer()
+    validator_cache = ValidatorCache()
+
+    async def fetch_after_change() -> tuple:
+        client = create_client(server, validator_cache)
+        first = await client.fetch_categories()
+        server.body = {'results': []}
+        server.etag = '"categories-v2"'
+        second = await client.fetch_categories()
+        third = await client.fetch_categories()
+        await client.session.aclose()
+
+        return first, second, third
+
+    first, second, third = asyncio.run(fetch_after_change())
+
+    assert first == CATEGORIES
+    assert second == {'results': []}
+    assert third == {'results': []}
+    # Only the last request matched the stored ETag
+    assert validator_cache.not_modified == 1
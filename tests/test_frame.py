@@ -0,0 +1,165 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from pypluggy.analytics.frame import TransactionFrame  # noqa: E402
+
+
+def make_transaction(id: str, date: str, **fields):
+    return {
+        'id': id,
+        'accountId': 'account',
+        'date': f'{date}T10:00:00.000Z',
+        'description': 'Groceries',
+        'type': 'DEBIT',
+        'amount': -10.0,
+        'currencyCode': 'BRL',
+        'category': 'Food',
+        **fields,
+    }
+
+
+TRANSACTIONS = [
+    make_transaction('a', '2024-01-15', amount=-30.0),
+    make_transaction('b', '2024-02-01', category='Transport'),
+    make_transaction('c', '2024-01-15', amount=-20.0, category=None),
+    make_transaction('d', '2024-03-31', amount=None, type='CREDIT'),
+    make_transaction('e', '2024-01-15', amount=-10.0, category='Transport'),
+]
+
+
+@pytest.fixture
+def frame():
+    return TransactionFrame.from_transactions(TRANSACTIONS)
+
+
+def get_ids(frame):
+    return frame['id'].tolist()
+
+
+def test_columns(frame):
+    assert len(frame) == 5
+    assert frame['category'].decode() == [
+        'Food',
+        'Transport',
+        None,
+        'Food',
+        'Transport',
+    ]
+    assert np.isnan(frame['amount'][3])
+    assert frame['date'][0] == np.datetime64('2024-01-15T10:00', 'ms')
+
+
+def test_month(frame):
+    assert frame.month.astype(str).tolist() == [
+        '2024-01',
+        '2024-02',
+        '2024-01',
+        '2024-03',
+        '2024-01',
+    ]
+
+
+def test_sort_is_stable_in_both_directions(frame):
+    assert get_ids(frame.sort('date')) == ['a', 'c', 'e', 'b', 'd']
+    # Rows with equal dates keep their input order when descending too
+    assert get_ids(frame.sort('date', descending=True)) == [
+        'd',
+        'b',
+        'a',
+        'c',
+        'e',
+    ]
+
+
+def test_sort_puts_nulls_last(frame):
+    assert get_ids(frame.sort('amount')) == ['a', 'c', 'b', 'e', 'd']
+    assert get_ids(frame.sort('amount', descending=True)) == [
+        'b',
+        'e',
+        'c',
+        'a',
+        'd',
+    ]
+    assert get_ids(frame.sort('category')) == ['a', 'd', 'b', 'e', 'c']
+    assert get_ids(frame.sort('category', descending=True)) == [
+        'b',
+        'e',
+        'a',
+        'd',
+        'c',
+    ]
+
+
+def test_sort_by_several_columns(frame):
+    assert get_ids(frame.sort(['category', 'amount'], descending=True)) == [
+        'b',
+        'e',
+        'a',
+        'd',
+        'c',
+    ]
+    assert get_ids(frame.sort(['date', 'amount'])) == [
+        'a',
+        'c',
+        'e',
+        'b',
+        'd',
+    ]
+
+
+def test_group_by_month_and_category(frame):
+    grouping = frame.group_by(['month', 'category'])
+    groups = {
+        (str(month), category): (count, total)
+        for month, category, count, total in zip(
+            grouping.keys['month'],
+            grouping.keys['category'],
+            grouping.count().tolist(),
+            grouping.sum(frame['amount']).tolist(),
+        )
+    }
+
+    assert groups == {
+        ('2024-01', None): (1, -20.0),
+        ('2024-01', 'Food'): (1, -30.0),
+        ('2024-01', 'Transport'): (1, -10.0),
+        ('2024-02', 'Transport'): (1, -10.0),
+        ('2024-03', 'Food'): (1, 0.0),
+    }
+
+
+def test_group_by_mean_ignores_nulls(frame):
+    grouping = frame.group_by('type')
+    means = dict(
+        zip(grouping.keys['type'], grouping.mean(frame['amount']).tolist())
+    )
+
+    assert means['DEBIT'] == -17.5
+    assert np.isnan(means['CREDIT'])
+
+
+def test_filters(frame):
+    assert get_ids(
+        frame.filter(frame.between('2024-01-15', '2024-02-01'))
+    ) == [
+        'a',
+        'b',
+        'c',
+        'e',
+    ]
+    assert get_ids(frame.filter(frame['category'].isin(['Transport']))) == [
+        'b',
+        'e',
+    ]
+
+
+def test_pages_share_categories():
+    frame = TransactionFrame.from_pages(
+        [{'results': TRANSACTIONS[:2]}, {'results': TRANSACTIONS[2:]}]
+    )
+
+    assert get_ids(frame) == ['a', 'b', 'c', 'd', 'e']
+    assert frame['category'].decode() == [
+        transaction['category'] for transaction in TRANSACTIONS
+    ]
@@ -0,0 +1,47 @@
+import datetime
+from dataclasses import dataclass
+
+import pytest
+
+from pypluggy.api.lazy import LazyTransaction, lazy
+from pypluggy.api.type.webhook import Data, WebhookEventPayload
+
+PAYLOAD = {
+    'id': 'event',
+    'eventId': 'event',
+    'event': 'item/updated',
+    'itemId': 'item',
+    'data': {'status': 'UPDATED'},
+}
+
+
+def test_data_field_is_read_from_the_payload():
+    record = lazy(WebhookEventPayload)(PAYLOAD)
+
+    assert record.data == Data(status='UPDATED')
+    assert record.itemId == 'item'
+    assert record.materialize().data == Data(status='UPDATED')
+
+
+def test_fields_are_decoded_on_access():
+    record = LazyTransaction(
+        {'id': 'tx0', 'date': '2024-01-31T10:00:00.000Z', 'amount': -12.5}
+    )
+
+    assert record.date == datetime.datetime(
+        2024, 1, 31, 10, tzinfo=datetime.timezone.utc
+    )
+    assert record.date is record.date
+    assert record.amount == -12.5
+    assert record == LazyTransaction(
+        {'id': 'tx0', 'date': '2024-01-31T10:00:00.000Z', 'amount': -12.5}
+    )
+
+
+def test_fields_clashing_with_record_members_are_rejected():
+    @dataclass
+    class Report:
+        materialize: str
+
+    with pytest.raises(ValueError):
+        lazy(Report)
@@ -0,0 +1,39 @@
+from pypluggy.api.transforms import convert_dates
+from pypluggy.export.mirror import SQLiteMirror
+
+TRANSACTION = {
+    'id': 'tx0',
+    'accountId': 'account',
+    'date': '2024-01-31T10:00:00.000Z',
+    'description': 'Coffee',
+    'type': 'DEBIT',
+    'amount': -12.5,
+    'currencyCode': 'BRL',
+    'category': 'Food',
+    'creditCardMetadata': {
+        'installmentNumber': 1,
+        'purchaseDate': '2024-01-30T09:30:00.000Z',
+    },
+}
+
+
+def test_parsed_dates_are_stored_like_the_api_sends_them(tmp_path):
+    with SQLiteMirror(str(tmp_path / 'mirror.db')) as mirror:
+        mirror.upsert('transactions', [convert_dates(TRANSACTION)])
+        (stored,) = mirror.get_transactions('account')
+
+    assert stored['date'] == TRANSACTION['date']
+    assert stored['creditCardMetadata'] == TRANSACTION['creditCardMetadata']
+
+
+def test_upserts_replace_mirrored_rows(tmp_path):
+    with SQLiteMirror(str(tmp_path / 'mirror.db')) as mirror:
+        mirror.upsert('transactions', [TRANSACTION])
+        mirror.upsert('transactions', [{**TRANSACTION, 'category': 'Bars'}])
+
+        assert mirror.get_transactions('account', category='Food') == []
+        (stored,) = mirror.get_transactions(
+            'account', from_='2024-01-31', to='2024-01-31'
+        )
+
+    assert stored['category'] == 'Bars'
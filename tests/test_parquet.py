@@ -0,0 +1,113 @@
+import asyncio
+import os
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from pypluggy.api.client import PluggyClient
+from pypluggy.api.type.transaction import Transaction
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from pypluggy.export.parquet import (  # noqa: E402
+    ParquetExporter,
+    PartitionedParquetWriter,
+    to_record_batch,
+)
+
+# 100 transactions a month over a year, latest first like the API
+TRANSACTIONS = [
+    {
+        'id': f'tx{index}',
+        'accountId': 'account',
+        'date': f'2024-{12 - index // 100:02d}-{28 - index % 28:02d}T10:00:00.000Z',
+        'description': f'Transaction {index}',
+        'type': 'DEBIT',
+        'amount': -12.5,
+        'currencyCode': 'BRL',
+    }
+    for index in range(1200)
+]
+
+
+def transactions_server(request: httpx.Request) -> httpx.Response:
+    if request.url.path == '/auth':
+        return httpx.Response(200, json={'apiKey': 'key'})
+
+    query = {
+        key: values[0]
+        for key, values in parse_qs(request.url.query.decode()).items()
+    }
+    page = int(query['page'])
+    size = int(query['pageSize'])
+
+    return httpx.Response(
+        200,
+        json={
+            'results': TRANSACTIONS[(page - 1) * size : page * size],
+            'page': page,
+            'total': len(TRANSACTIONS),
+            'totalPages': -(-len(TRANSACTIONS) // size),
+        },
+    )
+
+
+def test_fractional_amounts_in_int_fields_are_kept():
+    batch = to_record_batch(
+        Transaction,
+        [{**TRANSACTIONS[0], 'creditCardMetadata': {'totalAmount': 12.5}}],
+    )
+
+    metadata = batch.column('creditCardMetadata').to_pylist()[0]
+    assert metadata['totalAmount'] == 12.5
+
+
+def test_months_are_written_as_pages_move_past_them(tmp_path, monkeypatch):
+    buffered_rows = []
+    write = PartitionedParquetWriter.write
+
+    def record_buffered_rows(self, partition, batch):
+        write(self, partition, batch)
+        buffered_rows.append(
+            sum(
+                batch.num_rows
+                for buffer in self.buffers.values()
+                for batch in buffer
+            )
+        )
+
+    monkeypatch.setattr(
+        PartitionedParquetWriter, 'write', record_buffered_rows
+    )
+
+    async def export() -> None:
+        client = PluggyClient(
+            'client_id',
+            'client_secret',
+            session=httpx.AsyncClient(
+                transport=httpx.MockTransport(transactions_server)
+            ),
+            base_url='http://pluggy.test',
+        )
+        exporter = ParquetExporter(client, str(tmp_path))
+        with exporter.get_writer('transactions', Transaction) as writer:
+            await exporter.export_transactions(writer, 'item', 'account')
+        await client.session.aclose()
+
+    asyncio.run(export())
+
+    # Pages hold 500 rows, never more than a page and its months are kept
+    assert max(buffered_rows) <= 600
+
+    directory = os.path.join(
+        tmp_path, 'transactions', 'item_id=item', 'account_id=account'
+    )
+    months = sorted(os.listdir(directory))
+    assert months == [f'month=2024-{month:02d}' for month in range(1, 13)]
+    for month in months:
+        # Each month was completed once, in a single file
+        assert os.listdir(os.path.join(directory, month)) == ['part-0.parquet']
+        table = pq.read_table(os.path.join(directory, month, 'part-0.parquet'))
+        assert table.num_rows == 100
@@ -0,0 +1,132 @@
+import asyncio
+
+import httpx
+import pytest
+
+from pypluggy.api import retry
+from pypluggy.api.client import PluggyClient
+from pypluggy.api.retry import RetryPolicy
+
+
+class FlakyServer:
+    """Answers each request with the next of `responses`, repeating the last"""
+
+    def __init__(self, *responses: httpx.Response):
+        self.responses = list(responses)
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/auth':
+            return httpx.Response(200, json={'apiKey': 'key'})
+
+        self.requests.append(request)
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        return self.responses[0]
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Records the delays slept between attempts instead of waiting"""
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record_delay(delay):
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(retry.asyncio, 'sleep', record_delay)
+    return delays
+
+
+def run(server: FlakyServer, call, **policy) -> None:
+    async def send():
+        client = PluggyClient(
+            'client_id',
+            'client_secret',
+            session=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+            base_url='http://pluggy.test',
+            retry_policy=RetryPolicy(**policy),
+        )
+        try:
+            return await call(client)
+        finally:
+            await client.session.aclose()
+
+    return asyncio.run(send())
+
+
+def fetch_categories(client: PluggyClient):
+    return client.fetch_categories()
+
+
+def test_rate_limited_get_is_retried_after_retry_after(delays):
+    server = FlakyServer(
+        httpx.Response(429, headers={'Retry-After': '2'}),
+        httpx.Response(200, json={'results': []}),
+    )
+
+    assert run(server, fetch_categories) == {'results': []}
+    assert len(server.requests) == 2
+    assert delays == [2.0]
+
+
+def test_server_errors_are_retried_with_capped_backoff(delays):
+    server = FlakyServer(httpx.Response(503))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(server, fetch_categories, max_attempts=3, backoff_base=1)
+
+    assert len(server.requests) == 3
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 1
+    assert 0 <= delays[1] <= 2
+
+
+def test_post_is_not_retried(delays):
+    server = FlakyServer(
+        httpx.Response(503), httpx.Response(200, json={'id': 'webhook'})
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(
+            server,
+            lambda client: client.create_webhook(
+                'item/created', 'https://example.com'
+            ),
+        )
+
+    assert [request.method for request in server.requests] == ['POST']
+    assert delays == []
+
+
+def test_retries_stop_once_the_budget_is_spent(delays):
+    server = FlakyServer(
+        httpx.Response(429, headers={'Retry-After': '0.6'}),
+        httpx.Response(429, headers={'Retry-After': '0.6'}),
+        httpx.Response(200, json={'results': []}),
+    )
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        run(server, fetch_categories, budget=1)
+
+    assert error.value.response.status_code == 429
+    # The second wait would have gone over the budget
+    assert len(server.requests) == 2
+    assert delays == [0.6]
+
+
+def test_transport_errors_are_retried(delays):
+    attempts = []
+
+    def server(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/auth':
+            return httpx.Response(200, json={'apiKey': 'key'})
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError('Connection refused', request=request)
+        return httpx.Response(200, json={'results': []})
+
+    assert run(server, fetch_categories) == {'results': []}
+    assert len(attempts) == 2
+    assert len(delays) == 1
@@ -0,0 +1,108 @@
+import asyncio
+import csv
+import gzip
+import json
+
+import httpx
+import pytest
+
+from pypluggy.api.client import PluggyClient
+from pypluggy.export.stream import stream_transactions
+
+TRANSACTIONS = [
+    {
+        'id': 'tx0',
+        'accountId': 'account',
+        'date': '2024-01-31T10:00:00.123Z',
+        'description': 'Coffee',
+        'type': 'DEBIT',
+        'amount': -12.5,
+        'currencyCode': 'BRL',
+        'status': 'POSTED',
+        'creditCardMetadata': {
+            'installmentNumber': 1,
+            'purchaseDate': '2024-01-30T09:30:00.000Z',
+        },
+        'merchant': {'name': 'Café', 'businessName': 'Café Ltda'},
+    },
+    {
+        'id': 'tx1',
+        'accountId': 'account',
+        'date': '2024-01-30T00:00:00.000Z',
+        'description': 'Salary',
+        'type': 'CREDIT',
+        'amount': 1000.0,
+        'currencyCode': 'BRL',
+        'paymentData': {'payer': {'name': 'Employer'}, 'paymentMethod': 'PIX'},
+    },
+]
+
+
+def transactions_server(request: httpx.Request) -> httpx.Response:
+    if request.url.path == '/auth':
+        return httpx.Response(200, json={'apiKey': 'key'})
+
+    return httpx.Response(
+        200,
+        json={
+            'results': TRANSACTIONS,
+            'page': 1,
+            'total': len(TRANSACTIONS),
+            'totalPages': 1,
+        },
+    )
+
+
+async def export(path: str, parse_dates: bool) -> int:
+    client = PluggyClient(
+        'client_id',
+        'client_secret',
+        session=httpx.AsyncClient(
+            transport=httpx.MockTransport(transactions_server)
+        ),
+        base_url='http://pluggy.test',
+        parse_dates=parse_dates,
+    )
+    try:
+        return await stream_transactions(client, 'account', path)
+    finally:
+        await client.session.aclose()
+
+
+@pytest.mark.parametrize('name', ['transactions.jsonl', 'transactions.csv'])
+def test_files_do_not_depend_on_parse_dates(tmp_path, name):
+    files = {}
+    for parse_dates in (False, True):
+        path = tmp_path / f'{parse_dates}-{name}'
+        assert asyncio.run(export(str(path), parse_dates)) == 2
+        files[parse_dates] = path.read_bytes()
+
+    assert files[True] == files[False]
+
+
+def test_jsonl_keeps_the_api_layout(tmp_path):
+    path = tmp_path / 'transactions.jsonl.gz'
+    asyncio.run(export(str(path), parse_dates=True))
+
+    with gzip.open(path, 'rt', encoding='utf-8') as data_file:
+        written = [json.loads(line) for line in data_file]
+
+    assert written == TRANSACTIONS
+
+
+def test_csv_flattens_nested_fields(tmp_path):
+    path = tmp_path / 'transactions.csv'
+    asyncio.run(export(str(path), parse_dates=True))
+
+    with open(path, encoding='utf-8', newline='') as data_file:
+        rows = list(csv.DictReader(data_file))
+
+    assert [row['date'] for row in rows] == [
+        transaction['date'] for transaction in TRANSACTIONS
+    ]
+    assert rows[0]['creditCardMetadata.purchaseDate'] == (
+        '2024-01-30T09:30:00.000Z'
+    )
+    assert rows[0]['merchant.name'] == 'Café'
+    assert rows[1]['paymentData.payer.name'] == 'Employer'
+    assert rows[1]['merchant.name'] == ''
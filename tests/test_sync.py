@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from pypluggy.api.sync import (
+    TransactionSyncCursor,
+    diff_transactions,
+    get_transaction_fingerprint,
+)
+
+
+def make_transaction(id: str, date: str, **fields) -> dict:
+    return {
+        'id': id,
+        'accountId': 'account',
+        'date': f'{date}T10:00:00.000Z',
+        'description': 'Coffee',
+        'amount': -12.5,
+        'status': 'POSTED',
+        **fields,
+    }
+
+
+def sync(cursor, transactions, window_start):
+    return diff_transactions(
+        cursor, transactions, window_start, overlap=timedelta(days=7)
+    )
+
+
+def test_first_sync_upserts_everything():
+    transactions = [
+        make_transaction('a', '2024-01-01'),
+        make_transaction('b', '2024-01-20'),
+    ]
+    result = sync(TransactionSyncCursor('account'), transactions, None)
+
+    assert result.upserts == transactions
+    assert result.tombstones == []
+    assert result.cursor.high_water_mark == '2024-01-20'
+    # Only transactions inside the overlap window are remembered
+    assert list(result.cursor.window) == ['b']
+
+
+def test_unchanged_resync_has_no_changes():
+    transactions = [
+        make_transaction('a', '2024-01-15'),
+        make_transaction('b', '2024-01-20'),
+    ]
+    first = sync(TransactionSyncCursor('account'), transactions, None)
+    second = sync(first.cursor, transactions, '2024-01-13')
+
+    assert second.upserts == []
+    assert second.tombstones == []
+    assert second.cursor.high_water_mark == '2024-01-20'
+
+
+def test_changed_fingerprint_is_upserted():
+    transaction = make_transaction('a', '2024-01-20')
+    first = sync(TransactionSyncCursor('account'), [transaction], None)
+
+    changed = {**transaction, 'description': 'Coffee shop'}
+    second = sync(first.cursor, [changed], '2024-01-13')
+
+    assert second.upserts == [changed]
+    assert second.tombstones == []
+    assert second.cursor.window['a'][1] == get_transaction_fingerprint(changed)
+
+
+def test_pending_to_posted_swap_tombstones_the_pending_id():
+    pending = make_transaction('pending', '2024-01-20', status='PENDING')
+    first = sync(TransactionSyncCursor('account'), [pending], None)
+
+    posted = make_transaction('posted', '2024-01-20')
+    second = sync(first.cursor, [posted], '2024-01-13')
+
+    assert second.upserts == [posted]
+    assert second.tombstones == ['pending']
+    assert list(second.cursor.window) == ['posted']
+
+
+def test_entries_before_window_start_are_never_tombstoned():
+    cursor = TransactionSyncCursor(
+        'account',
+        high_water_mark='2024-01-20',
+        window={
+            'old': ['2024-01-10', 'fingerprint'],
+            'recent': ['2024-01-18', 'fingerprint'],
+        },
+    )
+    result = sync(cursor, [], '2024-01-13')
+
+    assert result.tombstones == ['recent']
+    # The high-water mark never moves back
+    assert result.cursor.high_water_mark == '2024-01-20'